@@ -3,21 +3,57 @@ Novarsis AI SEO Analyzer - One Click Solution
 Advanced AI + Web Crawler + Site Audit + Complete SEO Analysis
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-import requests
-from typing import Optional, List, Dict
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Annotated, Optional, List, Dict
 import uvicorn
-import json
+import asyncio
+from bisect import bisect_right
+import httpx
+import math
+import orjson
 import os
-from groq import Groq
-from bs4 import BeautifulSoup
+from groq import AsyncGroq, APIConnectionError, RateLimitError
+from selectolax.lexbor import LexborHTMLParser
 import re
 from datetime import datetime
 import csv
-
-app = FastAPI(title="Novarsis AI SEO Analyzer", version="1.0")
+import functools
+import gzip
+import hashlib
+import heapq
+import io
+import mimetypes
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from pathlib import Path
+from collections import Counter
+from string import Template
+from types import MappingProxyType
+from cachetools import TTLCache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client per worker, shared by every endpoint and closed on shutdown. It also crawls
+    # user-supplied sites, so its cookie jar refuses every cookie rather than replaying one site's
+    # cookies to whoever crawls it next and growing for the life of the process
+    app.state.http = httpx.AsyncClient(
+        timeout=30,
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        transport=httpx.AsyncHTTPTransport(retries=3, limits=httpx.Limits(max_connections=100,
+                                                                           max_keepalive_connections=50))
+    )
+    yield
+    await app.state.http.aclose()
+    await groq_client.close()
+
+
+app = FastAPI(title="Novarsis AI SEO Analyzer", version="1.0", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 # Configuration - Get API keys from environment variables
 API_KEY = os.getenv("SEMRUSH_API_KEY", "")
@@ -27,11 +63,47 @@ BASE_URL = "https://api.semrush.com/"
 BACKLINKS_URL = "https://api.semrush.com/analytics/v1/"
 SITE_AUDIT_URL = "https://api.semrush.com/reports/v1"
 PROJECT_ID = "26460775"
-groq_client = Groq(api_key=AI_API_KEY)
+# Async client so a multi-second completion never blocks the event loop; retries are handled
+# by call_groq's backoff rather than the SDK, and the pool is bounded for bursts of concurrent calls
+groq_client = AsyncGroq(
+    api_key=AI_API_KEY,
+    max_retries=0,
+    http_client=httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+)
+# Groq limits for the configured model (free tier defaults)
+AI_RPM = int(os.getenv("GROQ_RPM", 30))
+AI_TPM = int(os.getenv("GROQ_TPM", 6000))
+AI_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", 4))
+AI_MAX_ATTEMPTS = 3
+
+# Responses worth retrying, and how many times to retry them with exponential backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF = 0.5
+
+# Crawler limits; httpx advertises br/zstd itself only when it can decode them
+CRAWL_CHUNK_SIZE = 64 * 1024
+MAX_CRAWL_BYTES = 5 * 1024 * 1024
+# Elements whose text is not page content, removed in one native selector pass before counting words
+NON_CONTENT_SELECTOR = 'script, style, nav, footer, header, noscript, iframe'
+
+# Authority scores below 30 are toxic, below 50 potentially toxic, the rest healthy
+TOXICITY_THRESHOLDS = (30, 50)
+
+# Frontend sources; templates/index.html is rendered against the fingerprinted static/ URLs
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
+TEMPLATE_DIR = BASE_DIR / "templates"
+
+# Browser cache lifetime for GET API results: SEMrush data rarely changes intra-day, audit snapshots sooner
+API_CACHE_MAX_AGE = 3600
+AUDIT_CACHE_MAX_AGE = 300
+
+# Upper bound on issue-detail pages requested from SEMrush at the same time, across all requests
+ISSUE_PAGE_CONCURRENCY = 8
 
 # Complete Issue ID Mapping from Semrush Documentation
-ISSUE_MAPPING = {
-    # Errors
+ERROR_ISSUES = {
     1: "5xx errors",
     2: "4xx errors",
     3: "Title tag is missing or empty",
@@ -70,9 +142,10 @@ ISSUE_MAPPING = {
     44: "Malformed links",
     45: "Structured data that contains",
     46: "Viewport width not set",
-    111: "Slow page load speed",
+    111: "Slow page load speed"
+}
 
-    # Warnings
+WARNING_ISSUES = {
     12: "Broken external links",
     14: "Broken external images",
     31: "Links lead to HTTP pages for HTTPS",
@@ -108,9 +181,10 @@ ISSUE_MAPPING = {
     134: "Too many JavaScript and CSS files",
     135: "Unminified JavaScript and CSS files",
     136: "Warning - Too long URLs",
-    137: "Llms.txt not found",
+    137: "Llms.txt not found"
+}
 
-    # Notices
+NOTICE_ISSUES = {
     201: "Too long URLs",
     202: "Nofollow attributes in external links",
     203: "Robots.txt not found",
@@ -135,6 +209,11 @@ ISSUE_MAPPING = {
     223: "Content not optimized"
 }
 
+ISSUE_MAPPING = MappingProxyType({**ERROR_ISSUES, **WARNING_ISSUES, **NOTICE_ISSUES})
+
+# Sort order for severities, most critical first
+SEVERITY_RANK = MappingProxyType({'Error': 0, 'Warning': 1, 'Notice': 2})
+
 
 # Models
 class DomainRequest(BaseModel):
@@ -148,12 +227,41 @@ class KeywordRequest(BaseModel):
     limit: int = 30
 
 
+class PromptFields(BaseModel):
+    """Prompt inputs where missing or null values render as N/A"""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    @field_validator('*', mode='before')
+    @classmethod
+    def default_missing(cls, value):
+        return 'N/A' if value is None else value
+
+
+class BusinessGoals(PromptFields):
+    objective: str = 'N/A'
+    audience: str = 'N/A'
+    conversion: str = 'N/A'
+    strategy: str = 'N/A'
+    stage: str = 'N/A'
+    position: str = 'N/A'
+
+
+class Metrics(PromptFields):
+    rank: str = 'N/A'
+    organic_keywords: str = 'N/A'
+    organic_traffic: str = 'N/A'
+    backlinks: str = 'N/A'
+    referring_domains: str = 'N/A'
+    authority_score: str = 'N/A'
+
+
 class RecommendationRequest(BaseModel):
     domain: str
-    business_goals: Dict
-    metrics: Dict
+    business_goals: BusinessGoals
+    metrics: Metrics
     onpage_data: Optional[Dict] = None
     site_audit_data: Optional[Dict] = None
+    regenerate: bool = False
 
 
 class SiteAuditRequest(BaseModel):
@@ -167,92 +275,176 @@ class IssueExplanationRequest(BaseModel):
     issue_name: str
 
 
-# On-Page Crawler
-def crawl_website_onpage(domain: str) -> Dict:
-    try:
-        url = domain if domain.startswith('http') else f'https://{domain}'
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-        response.raise_for_status()
+# Caching
+_MISSING = object()
+# True while serving a request that asked for fresh data; memoized calls made under it refetch and
+# replace their entry instead of reusing it (tasks inherit the context, so nested calls refetch too)
+bypass_cache = ContextVar('bypass_cache', default=False)
 
-        soup = BeautifulSoup(response.text, 'html.parser')
 
-        # Meta Description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        meta_description = meta_desc['content'] if meta_desc and meta_desc.get('content') else None
-        meta_desc_length = len(meta_description) if meta_description else 0
+def ttl_cache(maxsize: int, ttl: int, cache_if=lambda result: True, key=None):
+    """Memoize a coroutine's results for `ttl` seconds; results rejected by `cache_if` are not stored"""
+    def decorator(func):
+        if not asyncio.iscoroutinefunction(func):
+            raise TypeError(f"ttl_cache only wraps coroutine functions, not {func.__qualname__}")
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        make_key = key or (lambda *args, **kwargs: args + tuple(sorted(kwargs.items())))
 
-        # Title
-        title_tag = soup.find('title')
-        title = title_tag.string if title_tag else None
-        title_length = len(title) if title else 0
+        def discard_unless_cacheable(cache_key, task):
+            if task.cancelled() or task.exception() is not None or not cache_if(task.result()):
+                if cache.get(cache_key) is task:
+                    del cache[cache_key]
 
-        # Headers
-        h1_tags = soup.find_all('h1')
-        h2_tags = soup.find_all('h2')
-        h3_tags = soup.find_all('h3')
-        h4_tags = soup.find_all('h4')
+        # The task is cached rather than its result, so identical calls made while it is
+        # still running share it instead of each going upstream
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = make_key(*args, **kwargs)
+            task = _MISSING if bypass_cache.get() else cache.get(cache_key, _MISSING)
+            if task is _MISSING:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                cache[cache_key] = task
+                task.add_done_callback(functools.partial(discard_unless_cacheable, cache_key))
+            return await asyncio.shield(task)
 
-        h1_count = len(h1_tags)
-        h1_text = [h.get_text(strip=True) for h in h1_tags]
+        wrapper.cache = cache
+        return wrapper
+    return decorator
 
-        # Content
-        for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-            script.decompose()
-        text_content = soup.get_text(separator=' ', strip=True)
-        text_content = re.sub(r'\s+', ' ', text_content)
-        word_count = len(text_content.split())
 
-        # Images
-        images = soup.find_all('img')
-        images_with_alt = [img for img in images if img.get('alt')]
-        images_without_alt = len(images) - len(images_with_alt)
+# On-Page Crawler
+def parse_html(content: bytes, charset: Optional[str] = None) -> LexborHTMLParser:
+    """Decode with the charset from the Content-Type header, else let Lexbor detect it (BOM or <meta charset>)"""
+    if charset:
+        try:
+            return LexborHTMLParser(content.decode(charset, errors='replace'))
+        except LookupError:
+            pass
+    return LexborHTMLParser(content, encoding=True)
+
+
+@ttl_cache(maxsize=256, ttl=300, cache_if=lambda result: result.get('crawl_success'),
+           key=lambda client, domain: domain)
+async def crawl_website_onpage(client: httpx.AsyncClient, domain: str) -> Dict:
+    try:
+        url = domain if domain.startswith('http') else f'https://{domain}'
+        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        async with client.stream('GET', url, headers=headers, timeout=10, follow_redirects=True) as response:
+            response.raise_for_status()
+            # Stop reading oversized pages instead of downloading and parsing them in full
+            content = bytearray()
+            async for chunk in response.aiter_bytes(CRAWL_CHUNK_SIZE):
+                content.extend(chunk)
+                if len(content) >= MAX_CRAWL_BYTES:
+                    del content[MAX_CRAWL_BYTES:]
+                    break
+            charset = response.charset_encoding
 
-        return {
-            'meta_description': meta_description,
-            'meta_desc_length': meta_desc_length,
-            'meta_desc_status': 'Good' if 150 <= meta_desc_length <= 160 else 'Needs Fix',
-            'title_tag': title,
-            'title_length': title_length,
-            'title_status': 'Good' if 50 <= title_length <= 60 else 'Needs Fix',
-            'h1_count': h1_count,
-            'h1_status': 'Good' if h1_count == 1 else 'Multiple' if h1_count > 1 else 'Missing',
-            'h1_text': h1_text,
-            'h2_count': len(h2_tags),
-            'h3_count': len(h3_tags),
-            'h4_count': len(h4_tags),
-            'word_count': word_count,
-            'content_status': 'Good' if word_count >= 1000 else 'Thin' if word_count < 300 else 'Moderate',
-            'images_total': len(images),
-            'images_without_alt': images_without_alt,
-            'crawl_success': True
-        }
+        # Decoding and parsing are CPU-bound, so keep them off the event loop
+        return await asyncio.to_thread(analyze_onpage_html, bytes(content), charset)
     except Exception as e:
         print(f"Crawl error: {str(e)}")
         return {'crawl_success': False, 'error': str(e)}
 
 
-def parse_response(text: str):
-    lines = text.strip().split('\n')
-    if len(lines) < 2:
+def analyze_onpage_html(content: bytes, charset: Optional[str] = None) -> Dict:
+    tree = parse_html(content, charset)
+
+    # Meta Description
+    meta_desc = tree.css_first('meta[name="description"]')
+    meta_description = meta_desc.attributes.get('content') if meta_desc else None
+    meta_desc_length = len(meta_description) if meta_description else 0
+
+    # Title
+    title_tag = tree.css_first('title')
+    title = title_tag.text() if title_tag else None
+    title_length = len(title) if title else 0
+
+    # Headers
+    h1_tags = tree.css('h1')
+    h2_tags = tree.css('h2')
+    h3_tags = tree.css('h3')
+    h4_tags = tree.css('h4')
+
+    h1_count = len(h1_tags)
+    h1_text = [h.text(strip=True) for h in h1_tags]
+
+    # Content
+    for node in tree.css(NON_CONTENT_SELECTOR):
+        node.decompose()
+    content_root = tree.body or tree.root
+    text_content = content_root.text(separator=' ', strip=True) if content_root else ''
+    word_count = len(text_content.split())
+
+    # Images
+    images_total = len(tree.css('img'))
+    images_without_alt = len(tree.css('img:not([alt]), img[alt=""]'))
+
+    return {
+        'meta_description': meta_description,
+        'meta_desc_length': meta_desc_length,
+        'meta_desc_status': 'Good' if 150 <= meta_desc_length <= 160 else 'Needs Fix',
+        'title_tag': title,
+        'title_length': title_length,
+        'title_status': 'Good' if 50 <= title_length <= 60 else 'Needs Fix',
+        'h1_count': h1_count,
+        'h1_status': 'Good' if h1_count == 1 else 'Multiple' if h1_count > 1 else 'Missing',
+        'h1_text': h1_text,
+        'h2_count': len(h2_tags),
+        'h3_count': len(h3_tags),
+        'h4_count': len(h4_tags),
+        'word_count': word_count,
+        'content_status': 'Good' if word_count >= 1000 else 'Thin' if word_count < 300 else 'Moderate',
+        'images_total': images_total,
+        'images_without_alt': images_without_alt,
+        'crawl_success': True
+    }
+
+
+def parse_response(text: str, quoted: bool = False):
+    """Parse a SEMrush ;-separated report. Only export_escape=1 reports quote their fields, so other
+    reports are read with quoting off and a stray quote can't swallow the following rows"""
+    reader = csv.DictReader(io.StringIO(text.strip()), delimiter=';',
+                            quoting=csv.QUOTE_MINIMAL if quoted else csv.QUOTE_NONE)
+    rows = []
+    for row in reader:
+        # Fields beyond the header (an unescaped ';' inside a value) land under a None key; drop them
+        row.pop(None, None)
+        rows.append(row)
+    if not rows:
         return None
-    headers = lines[0].split(';')
-    if len(lines) == 2:
-        return dict(zip(headers, lines[1].split(';')))
-    return [dict(zip(headers, line.split(';'))) for line in lines[1:]]
+    if len(rows) == 1:
+        return rows[0]
+    return rows
 
 
-def make_request(url: str, report_type: str, **kwargs):
+async def get_with_retry(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET through the shared client, retrying rate-limit and 5xx responses with exponential backoff"""
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        response = await client.get(url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == HTTP_MAX_RETRIES:
+            return response
+        await asyncio.sleep(HTTP_BACKOFF * 2 ** attempt)
+
+
+@ttl_cache(maxsize=1024, ttl=3600, cache_if=lambda result: result is not None,
+           key=lambda client, url, report_type, **kwargs: (url, report_type, tuple(sorted(kwargs.items()))))
+async def make_request(client: httpx.AsyncClient, url: str, report_type: str, **kwargs):
     params = {'key': API_KEY, 'type': report_type, **kwargs}
     try:
-        response = requests.get(url, params=params, timeout=30)
-        if response.status_code == 200 and 'ERROR' not in response.text.upper():
-            return parse_response(response.text)
-    except:
-        pass
+        response = await get_with_retry(client, url, params=params)
+        # SEMrush reports failures as a body starting with "ERROR nn :: ...", which an anchor or keyword row may not
+        if response.status_code == 200 and not response.text.startswith('ERROR'):
+            return parse_response(response.text, quoted=bool(kwargs.get('export_escape')))
+    except httpx.HTTPError as e:
+        print(f"Request error: {e}")
     return None
 
 
+async def get_backlinks_overview(client: httpx.AsyncClient, domain: str):
+    return await make_request(client, BACKLINKS_URL, 'backlinks_overview', target=domain, target_type='root_domain')
+
+
 def filter_brand_names(text: str) -> str:
     """Remove brand names from text"""
     # List of brands to filter out
@@ -278,8 +470,129 @@ def filter_brand_names(text: str) -> str:
     return filtered_text
 
 
-def generate_ai_recommendations(domain: str, business_goals: dict, metrics: dict, onpage_data: dict = None,
-                                site_audit_data: dict = None):
+# AI Rate Limiting
+class AsyncTokenBucket:
+    """Shapes calls to stay under a requests-per-minute and tokens-per-minute budget"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0):
+        tokens = min(tokens, self.tpm)
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    break
+                await asyncio.sleep(max((1 - self._requests) * 60 / self.rpm,
+                                        (tokens - self._tokens) * 60 / self.tpm))
+        yield
+
+
+ai_rate_limiter = AsyncTokenBucket(rpm=AI_RPM, tpm=AI_TPM)
+ai_semaphore = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+
+
+async def call_groq(messages: List[Dict], max_tokens: int):
+    """Run a JSON-mode chat completion under the shared concurrency cap, rate limit and backoff"""
+    # Rough estimate: ~4 chars per prompt token, and completions rarely use more than a quarter of max_tokens
+    estimated_tokens = sum(len(m['content']) for m in messages) // 4 + max_tokens // 4
+    for attempt in range(AI_MAX_ATTEMPTS):
+        try:
+            async with ai_semaphore, ai_rate_limiter.acquire(estimated_tokens):
+                return await groq_client.chat.completions.create(
+                    messages=messages,
+                    model=AI_MODEL,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"},
+                )
+        except (RateLimitError, APIConnectionError):
+            if attempt == AI_MAX_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(2 ** attempt)
+
+
+# Compiled once at import; filled per request from the validated goals and metrics
+RECOMMENDATION_PROMPT = Template("""You are an expert SEO consultant. Analyze the website data and provide actionable recommendations.
+
+DOMAIN: $domain
+
+BUSINESS:
+- Objective: $objective
+- Audience: $audience
+- Conversion: $conversion
+- Strategy: $strategy
+- Stage: $stage
+- Position: $position
+
+METRICS:
+- Rank: $rank
+- Keywords: $organic_keywords
+- Traffic: $organic_traffic
+- Backlinks: $backlinks
+$onpage_context$audit_context
+
+Generate 10 SEO recommendations based on the data above. Do not mention any brand names, tools, or platforms in your recommendations. Focus only on actionable SEO strategies and best practices.
+
+JSON format (an object with a "recommendations" array of 10 objects):
+{"recommendations":[{"category":"Short title","icon":"emoji","severity":"high/medium","issue":"Specific problem with actual data from above","fix":"1. Step 2. Step 3. Step 4. Step 5. Step 6. Step"}]}
+
+ONLY JSON, no markdown.""")
+
+
+# Served when the AI call fails; never cached so the next request retries the model
+FALLBACK_RECOMMENDATIONS = [
+    {"category": "Meta Description", "icon": "📝", "severity": "high", "issue": "Optimize meta descriptions",
+     "fix": "1. Write 150-160 chars 2. Include keywords 3. Add CTA 4. Benefit-focused 5. Unique 6. Test CTR"},
+    {"category": "Title Tags", "icon": "🏷️", "severity": "high", "issue": "Improve title tags",
+     "fix": "1. Keep 50-60 chars 2. Keywords first 3. Add brand 4. Unique 5. Power words 6. Match intent"},
+    {"category": "H1 Tags", "icon": "📑", "severity": "high", "issue": "Fix H1 structure",
+     "fix": "1. Single H1 2. Include keyword 3. Descriptive 4. Under 70 chars 5. Match title 6. Unique"},
+    {"category": "Headers", "icon": "📊", "severity": "medium", "issue": "Better header hierarchy",
+     "fix": "1. Logical order 2. H1-H2-H3-H4 3. Keywords natural 4. Descriptive 5. Section breaks 6. Consistent"},
+    {"category": "Content", "icon": "✍️", "severity": "high", "issue": "Enhance content quality",
+     "fix": "1. Create 1000+ words 2. Research competitors 3. Answer questions 4. Add value 5. Update often 6. E-E-A-T"},
+    {"category": "Keywords", "icon": "🔑", "severity": "high", "issue": "Refine keyword strategy",
+     "fix": "1. Long-tail research 2. Optimize title H1 URL 3. LSI keywords 4. 1-2% density 5. Alt text 6. User intent"},
+    {"category": "Images", "icon": "🖼️", "severity": "medium", "issue": "Add alt text to images",
+     "fix": "1. Descriptive alt 2. Keywords natural 3. Describe image 4. Under 125 chars 5. No stuffing 6. All images"},
+    {"category": "Technical SEO", "icon": "⚙️", "severity": "high", "issue": "Fix technical issues",
+     "fix": "1. Crawl errors 2. Robots.txt 3. XML sitemap 4. Broken links 5. Canonical tags 6. Schema markup"},
+    {"category": "Link Building", "icon": "🔗", "severity": "medium", "issue": "Strengthen backlinks",
+     "fix": "1. Quality content 2. Guest posts 3. Fix broken links 4. Relationships 5. Shareable assets 6. Monitor"},
+    {"category": "Conversions", "icon": "🎯", "severity": "high", "issue": "Optimize conversions",
+     "fix": "1. Clear CTAs 2. Simple forms 3. Trust signals 4. Landing pages 5. A/B test 6. Reduce friction"}
+]
+
+
+def recommendation_cache_key(domain: str, business_goals: BusinessGoals, metrics: Metrics, onpage_data: dict = None,
+                             site_audit_data: dict = None) -> str:
+    payload = orjson.dumps([domain, business_goals.model_dump(), metrics.model_dump(), onpage_data, site_audit_data],
+                           option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+@ttl_cache(maxsize=128, ttl=3600, key=recommendation_cache_key,
+           cache_if=lambda recs: bool(recs) and recs is not FALLBACK_RECOMMENDATIONS)
+async def generate_ai_recommendations(domain: str, business_goals: BusinessGoals, metrics: Metrics,
+                                      onpage_data: dict = None, site_audit_data: dict = None):
     onpage_context = ""
     if onpage_data and onpage_data.get('crawl_success'):
         onpage_context = f"""
@@ -295,70 +608,37 @@ ON-PAGE DATA:
     audit_context = ""
     if site_audit_data and site_audit_data.get('issues'):
         issues = site_audit_data['issues']
-        errors = [i for i in issues if i.get('severity') == 'Error']
-        warnings = [i for i in issues if i.get('severity') == 'Warning']
-        notices = [i for i in issues if i.get('severity') == 'Notice']
+        counts = site_audit_data.get('counts') or site_audit_payload(issues)['counts']
 
         audit_context = f"""
 SITE AUDIT DATA:
-- Total Issues: {len(issues)}
-- Errors: {len(errors)} critical issues
-- Warnings: {len(warnings)} issues
-- Notices: {len(notices)} minor issues
+- Total Issues: {counts['total']}
+- Errors: {counts['error']} critical issues
+- Warnings: {counts['warning']} issues
+- Notices: {counts['notice']} minor issues
 
 Top Critical Issues:
 """
-        # Add top 10 critical issues
-        sorted_issues = sorted(issues, key=lambda x: (
-            0 if x.get('severity') == 'Error' else 1 if x.get('severity') == 'Warning' else 2, -x.get('count', 0)))
-        for issue in sorted_issues[:10]:
+        # Add top 10 critical issues; a bounded heap avoids sorting the whole list
+        top_issues = heapq.nsmallest(10, issues, key=lambda x: (SEVERITY_RANK.get(x.get('severity'), 2),
+                                                                -x.get('count', 0)))
+        for issue in top_issues:
             audit_context += f"- [{issue.get('severity')}] {issue.get('issue_name')}: {issue.get('count')} pages affected\n"
 
-    prompt = f"""You are an expert SEO consultant. Analyze the website data and provide actionable recommendations.
-
-DOMAIN: {domain}
-
-BUSINESS:
-- Objective: {business_goals.get('objective', 'N/A')}
-- Audience: {business_goals.get('audience', 'N/A')}
-- Conversion: {business_goals.get('conversion', 'N/A')}
-- Strategy: {business_goals.get('strategy', 'N/A')}
-- Stage: {business_goals.get('stage', 'N/A')}
-- Position: {business_goals.get('position', 'N/A')}
-
-METRICS:
-- Rank: {metrics.get('rank', 'N/A')}
-- Keywords: {metrics.get('organic_keywords', 'N/A')}
-- Traffic: {metrics.get('organic_traffic', 'N/A')}
-- Backlinks: {metrics.get('backlinks', 'N/A')}
-{onpage_context}{audit_context}
-
-Generate 10 SEO recommendations based on the data above. Do not mention any brand names, tools, or platforms in your recommendations. Focus only on actionable SEO strategies and best practices.
-
-JSON format (10 objects):
-[{{"category":"Short title","icon":"emoji","severity":"high/medium","issue":"Specific problem with actual data from above","fix":"1. Step 2. Step 3. Step 4. Step 5. Step 6. Step"}}]
-
-ONLY JSON, no markdown."""
+    prompt = RECOMMENDATION_PROMPT.substitute(domain=domain, onpage_context=onpage_context, audit_context=audit_context,
+                                              **business_goals.model_dump(), **metrics.model_dump())
 
     try:
-        response = groq_client.chat.completions.create(
+        response = await call_groq(
             messages=[
                 {"role": "system",
                  "content": "You are an SEO expert. Return only JSON. Never mention brand names, tools, or platforms in recommendations."},
                 {"role": "user", "content": prompt}
             ],
-            model=AI_MODEL,
-            temperature=0.7,
             max_tokens=8000,
         )
 
-        text = response.choices[0].message.content.strip()
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
-
-        recs = json.loads(text.strip())
+        recs = orjson.loads(response.choices[0].message.content).get('recommendations')
         # Filter brand names from all recommendations
         if isinstance(recs, list):
             for rec in recs:
@@ -372,32 +652,11 @@ ONLY JSON, no markdown."""
         if isinstance(recs, list) and len(recs) >= 10:
             return recs[:10]
         return recs if isinstance(recs, list) else []
-    except:
-        return [
-            {"category": "Meta Description", "icon": "📝", "severity": "high", "issue": "Optimize meta descriptions",
-             "fix": "1. Write 150-160 chars 2. Include keywords 3. Add CTA 4. Benefit-focused 5. Unique 6. Test CTR"},
-            {"category": "Title Tags", "icon": "🏷️", "severity": "high", "issue": "Improve title tags",
-             "fix": "1. Keep 50-60 chars 2. Keywords first 3. Add brand 4. Unique 5. Power words 6. Match intent"},
-            {"category": "H1 Tags", "icon": "📑", "severity": "high", "issue": "Fix H1 structure",
-             "fix": "1. Single H1 2. Include keyword 3. Descriptive 4. Under 70 chars 5. Match title 6. Unique"},
-            {"category": "Headers", "icon": "📊", "severity": "medium", "issue": "Better header hierarchy",
-             "fix": "1. Logical order 2. H1-H2-H3-H4 3. Keywords natural 4. Descriptive 5. Section breaks 6. Consistent"},
-            {"category": "Content", "icon": "✍️", "severity": "high", "issue": "Enhance content quality",
-             "fix": "1. Create 1000+ words 2. Research competitors 3. Answer questions 4. Add value 5. Update often 6. E-E-A-T"},
-            {"category": "Keywords", "icon": "🔑", "severity": "high", "issue": "Refine keyword strategy",
-             "fix": "1. Long-tail research 2. Optimize title H1 URL 3. LSI keywords 4. 1-2% density 5. Alt text 6. User intent"},
-            {"category": "Images", "icon": "🖼️", "severity": "medium", "issue": "Add alt text to images",
-             "fix": "1. Descriptive alt 2. Keywords natural 3. Describe image 4. Under 125 chars 5. No stuffing 6. All images"},
-            {"category": "Technical SEO", "icon": "⚙️", "severity": "high", "issue": "Fix technical issues",
-             "fix": "1. Crawl errors 2. Robots.txt 3. XML sitemap 4. Broken links 5. Canonical tags 6. Schema markup"},
-            {"category": "Link Building", "icon": "🔗", "severity": "medium", "issue": "Strengthen backlinks",
-             "fix": "1. Quality content 2. Guest posts 3. Fix broken links 4. Relationships 5. Shareable assets 6. Monitor"},
-            {"category": "Conversions", "icon": "🎯", "severity": "high", "issue": "Optimize conversions",
-             "fix": "1. Clear CTAs 2. Simple forms 3. Trust signals 4. Landing pages 5. A/B test 6. Reduce friction"}
-        ]
+    except Exception:
+        return FALLBACK_RECOMMENDATIONS
 
 
-def generate_issue_explanation(issue_id: int, issue_name: str):
+async def generate_issue_explanation(issue_id: int, issue_name: str):
     """Generate detailed explanation for a specific SEO issue using AI"""
     prompt = f"""You are an SEO expert. Generate a detailed explanation for the following SEO issue:
 
@@ -421,24 +680,16 @@ Format your response as JSON:
 ONLY return the JSON, no markdown or extra text."""
 
     try:
-        response = groq_client.chat.completions.create(
+        response = await call_groq(
             messages=[
                 {"role": "system",
                  "content": "You are an SEO expert. Return only JSON. Never mention brand names, tools, or platforms in your explanations."},
                 {"role": "user", "content": prompt}
             ],
-            model=AI_MODEL,
-            temperature=0.7,
             max_tokens=1000,
         )
 
-        text = response.choices[0].message.content.strip()
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
-
-        result = json.loads(text.strip())
+        result = orjson.loads(response.choices[0].message.content)
         # Filter brand names from explanation
         if 'about' in result:
             result['about'] = filter_brand_names(result['about'])
@@ -454,60 +705,32 @@ ONLY return the JSON, no markdown or extra text."""
 
 
 # Site Audit Functions
-def get_all_issues_summary(project_id=PROJECT_ID):
-    """Get summary of all issues using the latest snapshot"""
+async def fetch_issues_summary(client: httpx.AsyncClient, project_id=PROJECT_ID):
+    """Fetch the summary of all issues in the latest snapshot, bypassing every cache"""
     url = f"{SITE_AUDIT_URL}/projects/{project_id}/siteaudit/snapshot"
     params = {"key": API_KEY}
 
     try:
-        response = requests.get(url, params=params)
+        response = await get_with_retry(client, url, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         snapshot_id = data.get('snapshot_id')
-        issues_data = []
-
-        # Process errors
-        if 'errors' in data:
-            for error in data['errors']:
-                issue_id = error['id']
-                count = error['count']
-                if count > 0:
-                    issues_data.append({
-                        'issue_id': issue_id,
-                        'issue_name': ISSUE_MAPPING.get(issue_id, f"Unknown Issue {issue_id}"),
-                        'severity': 'Error',
-                        'count': count,
-                        'delta': error.get('delta', 0)
-                    })
-
-        # Process warnings
-        if 'warnings' in data:
-            for warning in data['warnings']:
-                issue_id = warning['id']
-                count = warning['count']
-                if count > 0:
-                    issues_data.append({
-                        'issue_id': issue_id,
-                        'issue_name': ISSUE_MAPPING.get(issue_id, f"Unknown Issue {issue_id}"),
-                        'severity': 'Warning',
-                        'count': count,
-                        'delta': warning.get('delta', 0)
-                    })
-
-        # Process notices
-        if 'notices' in data:
-            for notice in data['notices']:
-                issue_id = notice['id']
-                count = notice['count']
-                if count > 0:
-                    issues_data.append({
-                        'issue_id': issue_id,
-                        'issue_name': ISSUE_MAPPING.get(issue_id, f"Unknown Issue {issue_id}"),
-                        'severity': 'Notice',
-                        'count': count,
-                        'delta': notice.get('delta', 0)
-                    })
+
+        # Errors, warnings and notices share one shape, so bucket them in a single pass
+        get_name = ISSUE_MAPPING.get
+        issues_data = [
+            {
+                'issue_id': item['id'],
+                'issue_name': get_name(item['id'], f"Unknown Issue {item['id']}"),
+                'severity': severity,
+                'count': item['count'],
+                'delta': item.get('delta', 0)
+            }
+            for key, severity in (('errors', 'Error'), ('warnings', 'Warning'), ('notices', 'Notice'))
+            for item in data.get(key, ())
+            if item['count'] > 0
+        ]
 
         return issues_data, snapshot_id
     except Exception as e:
@@ -515,143 +738,162 @@ def get_all_issues_summary(project_id=PROJECT_ID):
         return [], None
 
 
-def get_issue_details(project_id, snapshot_id, issue_id, limit=100):
-    """Fetch detailed pages for a specific issue"""
-    url = f"{SITE_AUDIT_URL}/projects/{project_id}/siteaudit/snapshot/{snapshot_id}/issue/{issue_id}"
-
-    params = {
-        "key": API_KEY,
-        "limit": limit,
-        "page": 1
-    }
+@ttl_cache(maxsize=64, ttl=300, cache_if=lambda result: result[1] is not None,
+           key=lambda client, project_id=PROJECT_ID: project_id)
+async def get_all_issues_summary(client: httpx.AsyncClient, project_id=PROJECT_ID):
+    """Get summary of all issues using the latest snapshot"""
+    return await fetch_issues_summary(client, project_id)
 
-    all_pages = []
 
-    try:
-        current_page = 1
+def site_audit_payload(issues: List[Dict]) -> Dict:
+    """Wrap audit issues with their per-severity totals so the frontend doesn't recount them"""
+    counts = Counter(i.get('severity') for i in issues)
+    return {"issues": issues,
+            "counts": {"total": len(issues), "error": counts['Error'], "warning": counts['Warning'],
+                       "notice": counts['Notice']}}
 
-        while True:
-            params['page'] = current_page
-            response = requests.get(url, params=params)
-            response.raise_for_status()
 
-            data = response.json()
+@ttl_cache(maxsize=64, ttl=60, cache_if=lambda result: result[0] is not None,
+           key=lambda client, project_id: project_id)
+async def get_snapshot(client: httpx.AsyncClient, project_id):
+    """Resolve a project's latest snapshot ID together with an issue_id -> issue_name index"""
+    # Fetched directly so this 60s TTL isn't stacked on top of the summary's 300s cache
+    issues, snapshot_id = await fetch_issues_summary(client, project_id)
+    return snapshot_id, {issue['issue_id']: issue['issue_name'] for issue in issues}
 
-            if 'data' in data:
-                pages_data = data['data']
-                total_count = data.get('total', 0)
 
-                if not pages_data:
-                    break
+issue_page_semaphore = asyncio.Semaphore(ISSUE_PAGE_CONCURRENCY)
 
-                all_pages.extend(pages_data)
 
-                # Check if we've got all pages
-                if len(all_pages) >= total_count:
-                    break
+async def get_issue_details(client: httpx.AsyncClient, project_id, snapshot_id, issue_id, limit=100):
+    """Fetch detailed pages for a specific issue, requesting the remaining pages concurrently"""
+    url = f"{SITE_AUDIT_URL}/projects/{project_id}/siteaudit/snapshot/{snapshot_id}/issue/{issue_id}"
 
-                current_page += 1
-            else:
-                break
+    async def fetch_page(page):
+        async with issue_page_semaphore:
+            response = await get_with_retry(client, url, params={"key": API_KEY, "limit": limit, "page": page})
+            response.raise_for_status()
+            return orjson.loads(response.content)
 
-        return all_pages, data.get('total', 0)
+    try:
+        # The first page tells us the total, after which the rest can be fetched in parallel
+        data = await fetch_page(1)
+        all_pages = list(data.get('data') or [])
+        total_count = data.get('total', 0)
+
+        if all_pages and len(all_pages) < total_count:
+            page_count = math.ceil(total_count / len(all_pages))
+            remaining = await asyncio.gather(*[fetch_page(page) for page in range(2, page_count + 1)])
+            for page_data in remaining:
+                all_pages.extend(page_data.get('data') or [])
+
+        return all_pages, total_count
     except Exception as e:
         print(f"Error fetching issue details: {e}")
         return [], 0
 
 
 # API Endpoints
-@app.post("/api/domain/overview")
-async def get_domain_overview(req: DomainRequest):
-    result = make_request(BASE_URL, 'domain_rank', domain=req.domain, database=req.database)
+@app.middleware("http")
+async def honour_no_cache(request: Request, call_next):
+    """A request sent with Cache-Control: no-cache (the Refresh button) skips the server-side memoization"""
+    bypass_cache.set('no-cache' in request.headers.get('cache-control', ''))
+    return await call_next(request)
+
+
+def cached_json(request: Request, content, max_age: int = API_CACHE_MAX_AGE) -> Response:
+    """Serialize a successful GET result with an ETag, answering a matching If-None-Match with 304"""
+    body = orjson.dumps(content)
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/domain/overview")
+async def get_domain_overview(req: Annotated[DomainRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BASE_URL, 'domain_rank', domain=req.domain, database=req.database)
     if result:
-        return {"success": True, "data": result}
+        return cached_json(request, {"success": True, "data": result})
     raise HTTPException(404, "Not found")
 
 
-@app.post("/api/organic/keywords")
-async def get_organic_keywords(req: DomainRequest):
-    result = make_request(BASE_URL, 'domain_organic', domain=req.domain, database=req.database, display_limit=100,
-                          export_escape=1)
+@app.get("/api/organic/keywords")
+async def get_organic_keywords(req: Annotated[DomainRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BASE_URL, 'domain_organic', domain=req.domain,
+                                database=req.database, display_limit=100, export_escape=1)
     if result:
-        return {"success": True, "data": result}
+        return cached_json(request, {"success": True, "data": result})
     raise HTTPException(404, "Not found")
 
 
-@app.post("/api/organic/competitors")
-async def get_competitors(req: DomainRequest):
-    result = make_request(BASE_URL, 'domain_organic_organic', domain=req.domain, database=req.database,
-                          display_limit=20)
+@app.get("/api/organic/competitors")
+async def get_competitors(req: Annotated[DomainRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BASE_URL, 'domain_organic_organic', domain=req.domain,
+                                database=req.database, display_limit=20)
     if result:
-        return {"success": True, "data": result}
+        return cached_json(request, {"success": True, "data": result})
     raise HTTPException(404, "Not found")
 
 
-@app.post("/api/backlinks/referring-domains")
-async def get_referring_domains(req: DomainRequest):
-    params = {'key': API_KEY, 'type': 'backlinks_refdomains', 'target': req.domain,
-              'target_type': 'root_domain', 'export_columns': 'domain_ascore,domain,backlinks_num,ip,country',
-              'display_limit': 500}
-    try:
-        response = requests.get(BACKLINKS_URL, params=params, timeout=30)
-        if response.status_code == 200:
-            result = parse_response(response.text)
-            if result:
-                toxic, potentially_toxic, healthy = [], [], []
-                for domain in result:
-                    score = float(domain.get('domain_ascore', 0))
-                    if score < 30:
-                        toxic.append(domain)
-                    elif score < 50:
-                        potentially_toxic.append(domain)
-                    else:
-                        healthy.append(domain)
-                return {"success": True, "data": result, "analysis": {"total": len(result), "toxic": len(toxic),
-                                                                      "potentially_toxic": len(potentially_toxic),
-                                                                      "healthy": len(healthy)}}
-    except:
-        pass
-    raise HTTPException(404, "Not found")
-
-
-@app.post("/api/backlinks/anchors")
-async def get_anchors(req: DomainRequest):
-    params = {'key': API_KEY, 'type': 'backlinks_anchors', 'target': req.domain, 'target_type': 'root_domain',
-              'export_columns': 'anchor,domains_num,backlinks_num', 'display_limit': 100}
-    try:
-        response = requests.get(BACKLINKS_URL, params=params, timeout=30)
-        if response.status_code == 200:
-            result = parse_response(response.text)
-            if result:
-                return {"success": True, "data": result}
-    except:
-        pass
-    raise HTTPException(404, "Not found")
-
-
-@app.post("/api/keyword/overview")
-async def get_keyword_overview(req: KeywordRequest):
-    result = make_request(BASE_URL, 'phrase_this', phrase=req.keyword, database=req.database, export_escape=1)
+@app.get("/api/backlinks/referring-domains")
+async def get_referring_domains(req: Annotated[DomainRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BACKLINKS_URL, 'backlinks_refdomains', target=req.domain,
+                                target_type='root_domain',
+                                export_columns='domain_ascore,domain,backlinks_num,ip,country', display_limit=500)
+    if not result:
+        raise HTTPException(404, "Not found")
+    if isinstance(result, dict):
+        result = [result]
+    # Only the bucket sizes are reported, so count instead of building filtered lists
+    buckets = [0, 0, 0]
+    for domain in result:
+        try:
+            score = float(domain.get('domain_ascore') or 0)
+        except ValueError:
+            # Malformed scores count as 0 rather than failing the whole report
+            score = 0
+        buckets[bisect_right(TOXICITY_THRESHOLDS, score)] += 1
+    toxic, potentially_toxic, healthy = buckets
+    analysis = {"total": len(result), "toxic": toxic, "potentially_toxic": potentially_toxic, "healthy": healthy}
+    return cached_json(request, {"success": True, "data": result, "analysis": analysis})
+
+
+@app.get("/api/backlinks/anchors")
+async def get_anchors(req: Annotated[DomainRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BACKLINKS_URL, 'backlinks_anchors', target=req.domain,
+                                target_type='root_domain', export_columns='anchor,domains_num,backlinks_num',
+                                display_limit=100)
+    if not result:
+        raise HTTPException(404, "Not found")
+    return cached_json(request, {"success": True, "data": result})
+
+
+@app.get("/api/keyword/overview")
+async def get_keyword_overview(req: Annotated[KeywordRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BASE_URL, 'phrase_this', phrase=req.keyword,
+                                database=req.database, export_escape=1)
     if result:
-        return {"success": True, "data": result}
+        return cached_json(request, {"success": True, "data": result})
     raise HTTPException(404, "Not found")
 
 
-@app.post("/api/keyword/related")
-async def get_related_keywords(req: KeywordRequest):
-    result = make_request(BASE_URL, 'phrase_related', phrase=req.keyword, database=req.database,
-                          display_limit=req.limit, export_escape=1)
+@app.get("/api/keyword/related")
+async def get_related_keywords(req: Annotated[KeywordRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BASE_URL, 'phrase_related', phrase=req.keyword,
+                                database=req.database, display_limit=req.limit, export_escape=1)
     if result:
-        return {"success": True, "data": result}
+        return cached_json(request, {"success": True, "data": result})
     raise HTTPException(404, "Not found")
 
 
-@app.post("/api/keyword/serp")
-async def get_serp(req: KeywordRequest):
-    result = make_request(BASE_URL, 'phrase_organic', phrase=req.keyword, database=req.database,
-                          display_limit=req.limit, export_escape=1)
+@app.get("/api/keyword/serp")
+async def get_serp(req: Annotated[KeywordRequest, Query()], request: Request):
+    result = await make_request(app.state.http, BASE_URL, 'phrase_organic', phrase=req.keyword,
+                                database=req.database, display_limit=req.limit, export_escape=1)
     if result:
-        return {"success": True, "data": result}
+        return cached_json(request, {"success": True, "data": result})
     raise HTTPException(404, "Not found")
 
 
@@ -660,15 +902,20 @@ async def get_recommendations(req: RecommendationRequest):
     try:
         # Get on-page data if not provided
         if not req.onpage_data:
-            req.onpage_data = crawl_website_onpage(req.domain)
+            req.onpage_data = await crawl_website_onpage(app.state.http, req.domain)
 
-        # Get site audit data if not provided
-        if not req.site_audit_data:
-            issues, _ = get_all_issues_summary(PROJECT_ID)
+        # Get site audit data if not provided; counts are always recomputed rather than trusted from the client
+        if req.site_audit_data and req.site_audit_data.get('issues'):
+            req.site_audit_data = site_audit_payload(req.site_audit_data['issues'])
+        else:
+            issues, _ = await get_all_issues_summary(app.state.http, PROJECT_ID)
             if issues:
-                req.site_audit_data = {"issues": issues}
+                req.site_audit_data = site_audit_payload(issues)
 
-        recs = generate_ai_recommendations(req.domain, req.business_goals, req.metrics, req.onpage_data,
+        # Regenerate asks the model again and replaces the memoized recommendations for these inputs
+        if req.regenerate:
+            bypass_cache.set(True)
+        recs = await generate_ai_recommendations(req.domain, req.business_goals, req.metrics, req.onpage_data,
                                            req.site_audit_data)
         return {"success": True, "recommendations": recs, "onpage_data": req.onpage_data,
                 "site_audit_data": req.site_audit_data}
@@ -677,37 +924,52 @@ async def get_recommendations(req: RecommendationRequest):
         return {"success": False, "error": str(e)}
 
 
-@app.post("/api/complete-analysis")
-async def complete_analysis(req: DomainRequest):
-    results = {}
-    results['domain_overview'] = make_request(BASE_URL, 'domain_rank', domain=req.domain, database=req.database)
-    results['organic_keywords'] = make_request(BASE_URL, 'domain_organic', domain=req.domain, database=req.database,
-                                               display_limit=50, export_escape=1)
-    results['competitors'] = make_request(BASE_URL, 'domain_organic_organic', domain=req.domain, database=req.database,
-                                          display_limit=10)
-    params = {'key': API_KEY, 'type': 'backlinks_overview', 'target': req.domain, 'target_type': 'root_domain'}
-    try:
-        response = requests.get(BACKLINKS_URL, params=params, timeout=30)
-        if response.status_code == 200:
-            results['backlinks_overview'] = parse_response(response.text)
-    except:
-        results['backlinks_overview'] = None
-    results['onpage_analysis'] = crawl_website_onpage(req.domain)
+@app.get("/api/complete-analysis")
+async def complete_analysis(req: Annotated[DomainRequest, Query()], request: Request):
+    # All sources are independent, so fire them together and wait for the slowest one
+    client = app.state.http
+    responses = await asyncio.gather(
+        make_request(client, BASE_URL, 'domain_rank', domain=req.domain, database=req.database),
+        make_request(client, BASE_URL, 'domain_organic', domain=req.domain, database=req.database,
+                     display_limit=50, export_escape=1),
+        make_request(client, BASE_URL, 'domain_organic_organic', domain=req.domain, database=req.database,
+                     display_limit=10),
+        get_backlinks_overview(client, req.domain),
+        crawl_website_onpage(client, req.domain),
+        get_all_issues_summary(client, PROJECT_ID),
+        return_exceptions=True
+    )
+    overview, keywords, competitors, backlinks, onpage, audit = [
+        None if isinstance(r, Exception) else r for r in responses]
+
+    results = {
+        'domain_overview': overview,
+        'organic_keywords': keywords,
+        'competitors': competitors,
+        'backlinks_overview': backlinks,
+        'onpage_analysis': onpage
+    }
 
     # Add site audit data
-    issues, _ = get_all_issues_summary(PROJECT_ID)
-    if issues:
-        results['site_audit'] = {"issues": issues}
+    if audit and audit[0]:
+        results['site_audit'] = site_audit_payload(audit[0])
 
-    return {"success": True, "data": results}
+    # A partial result is still returned, but not pinned in the browser cache; that includes a failed crawl
+    # or a missing audit, which the server-side caches refuse to keep as well
+    complete = (None not in (overview, keywords, competitors, backlinks)
+                and onpage and onpage.get('crawl_success') and audit and audit[0])
+    if not complete:
+        return {"success": True, "data": results}
+    return cached_json(request, {"success": True, "data": results})
 
 
 # Site Audit Endpoints
-@app.post("/api/site-audit/issues")
-async def get_site_audit_issues(req: SiteAuditRequest):
-    issues, snapshot_id = get_all_issues_summary(req.project_id)
+@app.get("/api/site-audit/issues")
+async def get_site_audit_issues(req: Annotated[SiteAuditRequest, Query()], request: Request):
+    issues, snapshot_id = await get_all_issues_summary(app.state.http, req.project_id)
     if issues and snapshot_id:
-        return {"success": True, "data": issues, "snapshot_id": snapshot_id}
+        return cached_json(request, {"success": True, "data": issues, "snapshot_id": snapshot_id},
+                           max_age=AUDIT_CACHE_MAX_AGE)
     return {"success": False, "message": "No issues found or error fetching issues"}
 
 
@@ -717,25 +979,18 @@ async def get_site_audit_issue_details(req: SiteAuditRequest):
         raise HTTPException(400, "Issue ID is required")
 
     # First get the snapshot ID
-    issues, snapshot_id = get_all_issues_summary(req.project_id)
+    snapshot_id, issue_names = await get_snapshot(app.state.http, req.project_id)
     if not snapshot_id:
         return {"success": False, "message": "Could not retrieve snapshot ID"}
 
     # Get issue details
-    pages, total = get_issue_details(req.project_id, snapshot_id, req.issue_id, req.limit)
+    pages, total = await get_issue_details(app.state.http, req.project_id, snapshot_id, req.issue_id, req.limit)
     if pages:
-        # Find issue name
-        issue_name = "Unknown Issue"
-        for issue in issues:
-            if issue['issue_id'] == req.issue_id:
-                issue_name = issue['issue_name']
-                break
-
         return {
             "success": True,
             "data": pages,
             "total": total,
-            "issue_name": issue_name,
+            "issue_name": issue_names.get(req.issue_id, "Unknown Issue"),
             "snapshot_id": snapshot_id
         }
     return {"success": False, "message": f"No data found for issue ID {req.issue_id}"}
@@ -745,907 +1000,88 @@ async def get_site_audit_issue_details(req: SiteAuditRequest):
 async def get_issue_explanation(req: IssueExplanationRequest):
     """Generate AI explanation for a specific issue"""
     try:
-        explanation = generate_issue_explanation(req.issue_id, req.issue_name)
+        explanation = await generate_issue_explanation(req.issue_id, req.issue_name)
         return {"success": True, "data": explanation}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    return """<!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width,initial-scale=1">
-<title>Novarsis AI SEO Analyzer</title>
-<style>
-*{margin:0;padding:0;box-sizing:border-box}
-body{font-family:Arial,sans-serif;background:linear-gradient(135deg,#f5f7fa,#c3cfe2);color:#2d3748;min-height:100vh;padding:20px}
-.container{max-width:1400px;margin:0 auto}
-.header{text-align:center;margin-bottom:40px}
-.header h1{font-size:2.8em;color:#667eea;margin-bottom:8px;font-weight:700}
-.header .subtitle{font-size:1.2em;color:#475569;margin-bottom:15px;font-weight:500}
-.section{background:white;border-radius:12px;padding:30px;margin-bottom:30px;box-shadow:0 2px 10px rgba(0,0,0,0.1)}
-.section h2{margin-bottom:20px;color:#1e293b}
-.question-group{margin-bottom:30px;padding-bottom:20px;border-bottom:1px solid #e2e8f0}
-.question-group:last-child{border-bottom:none}
-.question-title{font-weight:600;margin-bottom:15px}
-.radio-option{background:#f8fafc;border:2px solid #e2e8f0;border-radius:8px;padding:12px;margin-bottom:10px;cursor:pointer;display:flex;align-items:center}
-.radio-option:hover{border-color:#667eea}
-.radio-option.selected{border-color:#667eea;background:rgba(102,126,234,0.05)}
-.radio-option input{margin-right:10px;cursor:pointer}
-.radio-option label{cursor:pointer;flex:1}
-.tabs{display:flex;gap:10px;margin-bottom:20px;border-bottom:2px solid #e2e8f0;flex-wrap:wrap}
-.tab{padding:12px 20px;background:transparent;border:none;border-bottom:3px solid transparent;cursor:pointer;font-weight:600;color:#64748b}
-.tab:hover{color:#667eea}
-.tab.active{color:#667eea;border-bottom-color:#667eea}
-.tab-content{display:none}
-.tab-content.active{display:block}
-.input-group{display:grid;grid-template-columns:repeat(auto-fit,minmax(250px,1fr));gap:15px;margin-bottom:20px}
-.input-field label{display:block;margin-bottom:5px;font-weight:600;font-size:0.9em}
-.input-field input,.input-field select{width:100%;padding:10px;border:2px solid #e2e8f0;border-radius:6px}
-.btn{padding:10px 24px;background:#667eea;color:white;border:none;border-radius:6px;cursor:pointer;font-weight:600;margin-right:10px}
-.btn:hover{background:#5568d3}
-.btn-secondary{background:#4facfe}
-.loading{text-align:center;padding:40px}
-.spinner{border:4px solid #e2e8f0;border-top:4px solid #667eea;border-radius:50%;width:40px;height:40px;animation:spin 1s linear infinite;margin:20px auto}
-@keyframes spin{to{transform:rotate(360deg)}}
-.metric-grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(200px,1fr));gap:20px;margin:20px 0}
-.metric-card{background:linear-gradient(135deg,#667eea,#764ba2);padding:20px;border-radius:10px;color:white}
-.metric-card h3{font-size:0.85em;opacity:0.9;margin-bottom:8px}
-.metric-card .value{font-size:1.8em;font-weight:700}
-.table-container{margin-top:20px;overflow-x:auto}
-.data-table{width:100%;border-collapse:collapse}
-.data-table th,.data-table td{padding:12px;text-align:left;border-bottom:1px solid #e2e8f0}
-.data-table th{background:#f8fafc;font-weight:600;color:#667eea}
-.data-table tr:hover{background:#f8fafc}
-.alert-error{background:#fee;border:1px solid #fcc;color:#c00;padding:15px;border-radius:6px;margin-top:20px}
-.rec-card{background:white;border-radius:10px;padding:25px;margin-bottom:20px;border-left:4px solid #667eea;box-shadow:0 2px 8px rgba(0,0,0,0.05)}
-.rec-card.high{border-left-color:#ef4444}
-.rec-card.medium{border-left-color:#f59e0b}
-.rec-header{display:flex;align-items:center;gap:15px;margin-bottom:15px}
-.rec-icon{font-size:2em}
-.rec-title h3{font-size:1.3em;margin-bottom:5px}
-.severity-badge{padding:4px 12px;border-radius:15px;font-size:0.75em;font-weight:600;text-transform:uppercase}
-.severity-high{background:#fee2e2;color:#dc2626}
-.severity-medium{background:#fef3c7;color:#d97706}
-.issue-section{background:#f8fafc;padding:15px;border-radius:6px;margin-bottom:15px}
-.issue-section h4{margin-bottom:8px;color:#475569}
-.issue-section p{color:#64748b;line-height:1.6}
-.fix-section{background:#f0fdf4;padding:15px;border-radius:6px;border:1px solid #bbf7d0}
-.fix-section h4{margin-bottom:10px;color:#15803d}
-.fix-section ol{margin-left:20px;color:#166534}
-.fix-section li{margin-bottom:8px;line-height:1.5}
-.ai-loading{background:linear-gradient(135deg,#f093fb,#f5576c);color:white;padding:25px;border-radius:10px;text-align:center;margin:20px 0}
-.ai-pulse{display:inline-block;width:10px;height:10px;background:white;border-radius:50%;animation:pulse 1.5s ease-in-out infinite;margin:0 3px}
-@keyframes pulse{0%,100%{opacity:0.3}50%{opacity:1}}
-.onpage-box{background:#fef3c7;border:2px solid #fbbf24;padding:20px;border-radius:8px;margin:20px 0}
-.onpage-box h4{color:#92400e;margin-bottom:15px}
-.onpage-item{display:flex;justify-content:space-between;padding:10px 0;border-bottom:1px solid #fcd34d}
-.onpage-item:last-child{border-bottom:none}
-.onpage-label{font-weight:600;color:#78350f}
-.onpage-value{color:#451a03}
-.issue-card{background:white;border-radius:10px;padding:20px;margin-bottom:15px;border-left:4px solid #667eea;box-shadow:0 2px 8px rgba(0,0,0,0.05)}
-.issue-card.error{border-left-color:#ef4444}
-.issue-card.warning{border-left-color:#f59e0b}
-.issue-card.notice{border-left-color:#10b981}
-.issue-header{display:flex;justify-content:space-between;align-items:center;margin-bottom:10px}
-.issue-title{font-weight:600;font-size:1.1em}
-.issue-count{background:#f3f4f6;padding:4px 8px;border-radius:4px;font-weight:600}
-.issue-details{display:flex;gap:10px;margin-top:15px}
-.issue-id{background:#e5e7eb;padding:2px 6px;border-radius:4px;font-size:0.8em}
-.issue-severity{padding:2px 6px;border-radius:4px;font-size:0.8em;color:white}
-.issue-severity.error{background:#ef4444}
-.issue-severity.warning{background:#f59e0b}
-.issue-severity.notice{background:#10b981}
-.url-link{color:#667eea;text-decoration:none}
-.url-link:hover{text-decoration:underline}
-.modal{display:none;position:fixed;z-index:1000;left:0;top:0;width:100%;height:100%;overflow:auto;background-color:rgba(0,0,0,0.5)}
-.modal-content{background-color:white;margin:5% auto;padding:30px;border-radius:12px;width:80%;max-width:700px;box-shadow:0 4px 20px rgba(0,0,0,0.2);position:relative}
-.close{color:#aaa;float:right;font-size:28px;font-weight:bold;cursor:pointer;line-height:20px}
-.close:hover,.close:focus{color:#000}
-.modal h2{color:#667eea;margin-bottom:20px}
-.modal-about{background:#f0f9ff;padding:20px;border-radius:8px;margin-bottom:20px;border-left:4px solid #3b82f6}
-.modal-about h3{color:#1e40af;margin-bottom:10px;font-size:1.2em}
-.modal-about p{color:#1e3a8a;line-height:1.8;font-size:1.05em}
-.modal-fix{background:#f0fdf4;padding:20px;border-radius:8px;border-left:4px solid #22c55e}
-.modal-fix h3{color:#15803d;margin-bottom:10px;font-size:1.2em}
-.modal-fix p{color:#166534;line-height:2;white-space:pre-line;font-size:1.05em}
-</style>
-</head>
-<body>
-<div class="container">
-<div class="header">
-<h1>Novarsis AI SEO Analyzer</h1>
-<div class="subtitle">One Click Solution</div>
-</div>
-
-<div class="section">
-<h2>📋 Business Goals</h2>
-<div class="question-group">
-<div class="question-title">1. Primary objective?</div>
-<div class="radio-option" onclick="selectOption(this,'objective','sales')"><input type="radio" name="objective" value="sales" id="obj1"><label for="obj1">Increase sales</label></div>
-<div class="radio-option" onclick="selectOption(this,'objective','leads')"><input type="radio" name="objective" value="leads" id="obj2"><label for="obj2">Generate leads</label></div>
-<div class="radio-option" onclick="selectOption(this,'objective','brand')"><input type="radio" name="objective" value="brand" id="obj3"><label for="obj3">Build brand</label></div>
-<div class="radio-option" onclick="selectOption(this,'objective','traffic')"><input type="radio" name="objective" value="traffic" id="obj4"><label for="obj4">Grow traffic</label></div>
-</div>
-
-<div class="question-group">
-<div class="question-title">2. Target audience?</div>
-<div class="radio-option" onclick="selectOption(this,'audience','b2b')"><input type="radio" name="audience" value="b2b" id="aud1"><label for="aud1">B2B</label></div>
-<div class="radio-option" onclick="selectOption(this,'audience','b2c')"><input type="radio" name="audience" value="b2c" id="aud2"><label for="aud2">B2C</label></div>
-<div class="radio-option" onclick="selectOption(this,'audience','mixed')"><input type="radio" name="audience" value="mixed" id="aud3"><label for="aud3">Mixed</label></div>
-</div>
-
-<div class="question-group">
-<div class="question-title">3. Conversion goal?</div>
-<div class="radio-option" onclick="selectOption(this,'conversion','purchase')"><input type="radio" name="conversion" value="purchase" id="con1"><label for="con1">Purchase</label></div>
-<div class="radio-option" onclick="selectOption(this,'conversion','form')"><input type="radio" name="conversion" value="form" id="con2"><label for="con2">Form submission</label></div>
-<div class="radio-option" onclick="selectOption(this,'conversion','signup')"><input type="radio" name="conversion" value="signup" id="con3"><label for="con3">Signup</label></div>
-</div>
-
-<div class="question-group">
-<div class="question-title">4. Content strategy?</div>
-<div class="radio-option" onclick="selectOption(this,'strategy','educational')"><input type="radio" name="strategy" value="educational" id="str1"><label for="str1">Educational</label></div>
-<div class="radio-option" onclick="selectOption(this,'strategy','product')"><input type="radio" name="strategy" value="product" id="str2"><label for="str2">Product-focused</label></div>
-</div>
-
-<div class="question-group">
-<div class="question-title">5. Business stage?</div>
-<div class="radio-option" onclick="selectOption(this,'stage','startup')"><input type="radio" name="stage" value="startup" id="sta1"><label for="sta1">Startup</label></div>
-<div class="radio-option" onclick="selectOption(this,'stage','growth')"><input type="radio" name="stage" value="growth" id="sta2"><label for="sta2">Growth</label></div>
-<div class="radio-option" onclick="selectOption(this,'stage','established')"><input type="radio" name="stage" value="established" id="sta3"><label for="sta3">Established</label></div>
-</div>
-
-<div class="question-group">
-<div class="question-title">6. Competitive position?</div>
-<div class="radio-option" onclick="selectOption(this,'position','leader')"><input type="radio" name="position" value="leader" id="pos1"><label for="pos1">Leader</label></div>
-<div class="radio-option" onclick="selectOption(this,'position','challenger')"><input type="radio" name="position" value="challenger" id="pos2"><label for="pos2">Challenger</label></div>
-<div class="radio-option" onclick="selectOption(this,'position','niche')"><input type="radio" name="position" value="niche" id="pos3"><label for="pos3">Niche</label></div>
-</div>
-</div>
-
-<div class="section">
-<div class="tabs">
-<button class="tab active" onclick="switchTab('domain')">Domain</button>
-<button class="tab" onclick="switchTab('organic')">Organic</button>
-<button class="tab" onclick="switchTab('backlinks')">Backlinks</button>
-<button class="tab" onclick="switchTab('keywords')">Keywords</button>
-<button class="tab" onclick="switchTab('complete')">Complete</button>
-<button class="tab" onclick="switchTab('site-audit')">Site Audit</button>
-<button class="tab" onclick="switchTab('ai')">AI Recommendations</button>
-</div>
-
-<div id="domain" class="tab-content active">
-<h2>Domain Analytics</h2>
-<div class="input-group">
-<div class="input-field"><label>Domain</label><input type="text" id="domain-input" value="pub.dev"></div>
-<div class="input-field"><label>Database</label><select id="domain-db">
-<option value="us">🇺🇸 United States</option>
-<option value="uk">🇬🇧 United Kingdom</option>
-<option value="ca">🇨🇦 Canada</option>
-<option value="au">🇦🇺 Australia</option>
-<option value="in">🇮🇳 India</option>
-<option value="de">🇩🇪 Germany</option>
-<option value="fr">🇫🇷 France</option>
-<option value="es">🇪🇸 Spain</option>
-<option value="it">🇮🇹 Italy</option>
-<option value="br">🇧🇷 Brazil</option>
-<option value="mx">🇲🇽 Mexico</option>
-<option value="ar">🇦🇷 Argentina</option>
-<option value="nl">🇳🇱 Netherlands</option>
-<option value="se">🇸🇪 Sweden</option>
-<option value="pl">🇵🇱 Poland</option>
-<option value="tr">🇹🇷 Turkey</option>
-<option value="ru">🇷🇺 Russia</option>
-<option value="jp">🇯🇵 Japan</option>
-<option value="kr">🇰🇷 South Korea</option>
-<option value="cn">🇨🇳 China</option>
-<option value="sg">🇸🇬 Singapore</option>
-<option value="ae">🇦🇪 UAE</option>
-<option value="za">🇿🇦 South Africa</option>
-<option value="ng">🇳🇬 Nigeria</option>
-</select></div>
-</div>
-<button class="btn" onclick="analyzeDomain()">Analyze</button>
-<div id="domain-results"></div>
-</div>
-
-<div id="organic" class="tab-content">
-<h2>Organic Search</h2>
-<div class="input-group">
-<div class="input-field"><label>Domain</label><input type="text" id="organic-input" value="pub.dev"></div>
-<div class="input-field"><label>Database</label><select id="organic-db">
-<option value="us">🇺🇸 United States</option>
-<option value="uk">🇬🇧 United Kingdom</option>
-<option value="ca">🇨🇦 Canada</option>
-<option value="au">🇦🇺 Australia</option>
-<option value="in">🇮🇳 India</option>
-<option value="de">🇩🇪 Germany</option>
-<option value="fr">🇫🇷 France</option>
-<option value="es">🇪🇸 Spain</option>
-<option value="it">🇮🇹 Italy</option>
-<option value="br">🇧🇷 Brazil</option>
-<option value="mx">🇲🇽 Mexico</option>
-<option value="ar">🇦🇷 Argentina</option>
-<option value="nl">🇳🇱 Netherlands</option>
-<option value="se">🇸🇪 Sweden</option>
-<option value="pl">🇵🇱 Poland</option>
-<option value="tr">🇹🇷 Turkey</option>
-<option value="ru">🇷🇺 Russia</option>
-<option value="jp">🇯🇵 Japan</option>
-<option value="kr">🇰🇷 South Korea</option>
-<option value="cn">🇨🇳 China</option>
-<option value="sg">🇸🇬 Singapore</option>
-<option value="ae">🇦🇪 UAE</option>
-<option value="za">🇿🇦 South Africa</option>
-<option value="ng">🇳🇬 Nigeria</option>
-</select></div>
-</div>
-<button class="btn" onclick="analyzeOrganic()">Keywords</button>
-<button class="btn btn-secondary" onclick="getCompetitors()">Competitors</button>
-<div id="organic-results"></div>
-</div>
-
-<div id="backlinks" class="tab-content">
-<h2>Backlinks</h2>
-<div class="input-group">
-<div class="input-field"><label>Domain</label><input type="text" id="backlinks-input" value="pub.dev"></div>
-</div>
-<button class="btn" onclick="getReferring()">Referring Domains</button>
-<button class="btn btn-secondary" onclick="getAnchors()">Anchors</button>
-<div id="backlinks-results"></div>
-</div>
-
-<div id="keywords" class="tab-content">
-<h2>Keyword Research</h2>
-<div class="input-group">
-<div class="input-field"><label>Keyword</label><input type="text" id="keyword-input" value="python tutorial"></div>
-<div class="input-field"><label>Database</label><select id="keyword-db">
-<option value="us">🇺🇸 United States</option>
-<option value="uk">🇬🇧 United Kingdom</option>
-<option value="ca">🇨🇦 Canada</option>
-<option value="au">🇦🇺 Australia</option>
-<option value="in">🇮🇳 India</option>
-<option value="de">🇩🇪 Germany</option>
-<option value="fr">🇫🇷 France</option>
-<option value="es">🇪🇸 Spain</option>
-<option value="it">🇮🇹 Italy</option>
-<option value="br">🇧🇷 Brazil</option>
-<option value="mx">🇲🇽 Mexico</option>
-<option value="ar">🇦🇷 Argentina</option>
-<option value="nl">🇳🇱 Netherlands</option>
-<option value="se">🇸🇪 Sweden</option>
-<option value="pl">🇵🇱 Poland</option>
-<option value="tr">🇹🇷 Turkey</option>
-<option value="ru">🇷🇺 Russia</option>
-<option value="jp">🇯🇵 Japan</option>
-<option value="kr">🇰🇷 South Korea</option>
-<option value="cn">🇨🇳 China</option>
-<option value="sg">🇸🇬 Singapore</option>
-<option value="ae">🇦🇪 UAE</option>
-<option value="za">🇿🇦 South Africa</option>
-<option value="ng">🇳🇬 Nigeria</option>
-</select></div>
-</div>
-<button class="btn" onclick="analyzeKeyword()">Analyze</button>
-<button class="btn btn-secondary" onclick="getRelated()">Related</button>
-<div id="keywords-results"></div>
-</div>
-
-<div id="complete" class="tab-content">
-<h2>Complete Analysis</h2>
-<div class="input-group">
-<div class="input-field"><label>Domain</label><input type="text" id="complete-input" value="pub.dev"></div>
-<div class="input-field"><label>Database</label><select id="complete-db">
-<option value="us">🇺🇸 United States</option>
-<option value="uk">🇬🇧 United Kingdom</option>
-<option value="ca">🇨🇦 Canada</option>
-<option value="au">🇦🇺 Australia</option>
-<option value="in">🇮🇳 India</option>
-<option value="de">🇩🇪 Germany</option>
-<option value="fr">🇫🇷 France</option>
-<option value="es">🇪🇸 Spain</option>
-<option value="it">🇮🇹 Italy</option>
-<option value="br">🇧🇷 Brazil</option>
-<option value="mx">🇲🇽 Mexico</option>
-<option value="ar">🇦🇷 Argentina</option>
-<option value="nl">🇳🇱 Netherlands</option>
-<option value="se">🇸🇪 Sweden</option>
-<option value="pl">🇵🇱 Poland</option>
-<option value="tr">🇹🇷 Turkey</option>
-<option value="ru">🇷🇺 Russia</option>
-<option value="jp">🇯🇵 Japan</option>
-<option value="kr">🇰🇷 South Korea</option>
-<option value="cn">🇨🇳 China</option>
-<option value="sg">🇸🇬 Singapore</option>
-<option value="ae">🇦🇪 UAE</option>
-<option value="za">🇿🇦 South Africa</option>
-<option value="ng">🇳🇬 Nigeria</option>
-</select></div>
-</div>
-<button class="btn" onclick="completeAnalysis()">Run Analysis</button>
-<div id="complete-results"></div>
-</div>
-
-<div id="site-audit" class="tab-content">
-<h2>🔍 Site Audit Issues</h2>
-<div class="input-group">
-<div class="input-field"><label>Project ID</label><input type="text" id="project-id-input" value="26460775"></div>
-<div class="input-field"><label>Issue ID (Optional)</label><input type="text" id="issue-id-input" placeholder="e.g., 15"></div>
-</div>
-<button class="btn" onclick="getSiteAuditIssues()">Get Issues</button>
-<button class="btn btn-secondary" onclick="getIssueDetails()">Get Issue Details</button>
-<div id="site-audit-results"></div>
-</div>
-
-<div id="ai" class="tab-content">
-<h2>🤖 AI-Powered SEO Recommendations</h2>
-<p style="color:#64748b;margin-bottom:20px">✨ AI analyzes: Business Goals + Website Metrics + On-Page Data + Site Audit Issues</p>
-<div id="ai-results"></div>
-</div>
-
-</div>
-</div>
-
-<!-- Modal for Issue Explanation -->
-<div id="issueModal" class="modal">
-  <div class="modal-content">
-    <span class="close" onclick="closeModal()">&times;</span>
-    <h2 id="modalTitle">Issue Explanation</h2>
-    <div class="ai-loading" id="modalLoading" style="display:none">
-      <p>🤖 Generating explanation with AI...</p>
-      <div><span class="ai-pulse"></span><span class="ai-pulse"></span><span class="ai-pulse"></span></div>
-    </div>
-    <div id="modalBody" style="display:none">
-      <div class="modal-about">
-        <h3>📚 About the Issue</h3>
-        <p id="modalAbout"></p>
-      </div>
-      <div class="modal-fix">
-        <h3>🔧 How to Fix It</h3>
-        <p id="modalFix"></p>
-      </div>
-    </div>
-  </div>
-</div>
-
-<script>
-let businessGoals = {objective:null,audience:null,conversion:null,strategy:null,stage:null,position:null};
-let currentMetrics = {rank:null,organic_keywords:null,organic_traffic:null,backlinks:null,referring_domains:null,authority_score:null};
-let currentOnPage = null;
-let currentDomain = null;
-let currentSnapshotId = null;
-let currentSiteAudit = null;
-
-function selectOption(el, key, val) {
-  el.parentElement.querySelectorAll('.radio-option').forEach(e => e.classList.remove('selected'));
-  el.classList.add('selected');
-  el.querySelector('input').checked = true;
-  businessGoals[key] = val;
-}
-
-function switchTab(tab) {
-  document.querySelectorAll('.tab-content').forEach(e => e.classList.remove('active'));
-  document.querySelectorAll('.tab').forEach(e => e.classList.remove('active'));
-  document.getElementById(tab).classList.add('active');
-  event.target.classList.add('active');
-  if (tab === 'ai') loadAI();
-}
-
-function showLoading(id) {
-  document.getElementById(id).innerHTML = '<div class="loading"><div class="spinner"></div><p>Loading...</p></div>';
-}
-
-function showError(id, msg) {
-  document.getElementById(id).innerHTML = '<div class="alert-error"><strong>Error:</strong> ' + msg + '</div>';
-}
-
-function clean(val) {
-  return val ? String(val).replace(/"/g,'').replace(/\\r/g,'') : 'N/A';
-}
-
-function fmt(val) {
-  return val && val !== 'N/A' ? parseInt(val).toLocaleString() : 'N/A';
-}
-
-async function showWhyAndHowToFix(issueId, issueName) {
-  const modal = document.getElementById('issueModal');
-  const modalTitle = document.getElementById('modalTitle');
-  const modalLoading = document.getElementById('modalLoading');
-  const modalBody = document.getElementById('modalBody');
-  const modalAbout = document.getElementById('modalAbout');
-  const modalFix = document.getElementById('modalFix');
-
-  // Show modal
-  modal.style.display = 'block';
-  modalTitle.textContent = 'Issue #' + issueId + ': ' + issueName;
-  modalLoading.style.display = 'block';
-  modalBody.style.display = 'none';
-
-  try {
-    const res = await fetch('/api/issue-explanation', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({
-        issue_id: issueId,
-        issue_name: issueName
-      })
-    });
-
-    const data = await res.json();
-
-    if (data.success) {
-      modalAbout.textContent = data.data.about;
-      modalFix.textContent = data.data.how_to_fix;
-      modalLoading.style.display = 'none';
-      modalBody.style.display = 'block';
-    } else {
-      modalLoading.innerHTML = '<div class="alert-error">Failed to generate explanation: ' + (data.error || 'Unknown error') + '</div>';
-    }
-  } catch (e) {
-    modalLoading.innerHTML = '<div class="alert-error">Error: ' + e.message + '</div>';
-  }
-}
-
-function closeModal() {
-  document.getElementById('issueModal').style.display = 'none';
-}
-
-// Close modal when clicking outside
-window.onclick = function(event) {
-  const modal = document.getElementById('issueModal');
-  if (event.target == modal) {
-    modal.style.display = 'none';
-  }
-}
-
-async function analyzeDomain() {
-  const domain = document.getElementById('domain-input').value;
-  const database = document.getElementById('domain-db').value;
-  if (!domain) return showError('domain-results', 'Enter domain');
-  currentDomain = domain;
-  showLoading('domain-results');
-  try {
-    const res = await fetch('/api/domain/overview', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({domain: domain, database: database})
-    });
-    const data = await res.json();
-    if (data.success) {
-      const d = data.data;
-      currentMetrics.rank = d.Rank;
-      currentMetrics.organic_keywords = d['Organic Keywords'];
-      currentMetrics.organic_traffic = d['Organic Traffic'];
-      let html = '<div class="metric-grid">';
-      html += '<div class="metric-card"><h3>Rank</h3><div class="value">#' + fmt(clean(d.Rank)) + '</div></div>';
-      html += '<div class="metric-card"><h3>Keywords</h3><div class="value">' + fmt(clean(d['Organic Keywords'])) + '</div></div>';
-      html += '<div class="metric-card"><h3>Traffic</h3><div class="value">' + fmt(clean(d['Organic Traffic'])) + '</div></div>';
-      html += '<div class="metric-card"><h3>Value</h3><div class="value">$' + fmt(clean(d['Organic Cost'])) + '</div></div>';
-      html += '</div>';
-      document.getElementById('domain-results').innerHTML = html;
-    } else {
-      showError('domain-results', 'Failed');
-    }
-  } catch (e) {
-    showError('domain-results', e.message);
-  }
-}
-
-async function analyzeOrganic() {
-  const domain = document.getElementById('organic-input').value;
-  const database = document.getElementById('organic-db').value;
-  if (!domain) return;
-  showLoading('organic-results');
-  try {
-    const res = await fetch('/api/organic/keywords', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({domain: domain, database: database})
-    });
-    const data = await res.json();
-    if (data.success) {
-      let html = '<div class="table-container"><table class="data-table"><thead><tr><th>Keyword</th><th>Pos</th><th>Volume</th></tr></thead><tbody>';
-      data.data.slice(0, 50).forEach(r => {
-        html += '<tr><td><strong>' + clean(r.Keyword) + '</strong></td><td>' + clean(r.Position) + '</td><td>' + fmt(clean(r['Search Volume'])) + '</td></tr>';
-      });
-      html += '</tbody></table></div>';
-      document.getElementById('organic-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('organic-results', e.message);
-  }
-}
-
-async function getCompetitors() {
-  const domain = document.getElementById('organic-input').value;
-  const database = document.getElementById('organic-db').value;
-  if (!domain) return;
-  showLoading('organic-results');
-  try {
-    const res = await fetch('/api/organic/competitors', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({domain: domain, database: database})
-    });
-    const data = await res.json();
-    if (data.success) {
-      let html = '<div class="table-container"><table class="data-table"><thead><tr><th>Domain</th><th>Common</th><th>Organic</th></tr></thead><tbody>';
-      data.data.forEach(r => {
-        html += '<tr><td><strong>' + clean(r.Domain) + '</strong></td><td>' + fmt(clean(r['Common Keywords'])) + '</td><td>' + fmt(clean(r['Organic Keywords'])) + '</td></tr>';
-      });
-      html += '</tbody></table></div>';
-      document.getElementById('organic-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('organic-results', e.message);
-  }
-}
-
-async function getReferring() {
-  const domain = document.getElementById('backlinks-input').value;
-  if (!domain) return;
-  showLoading('backlinks-results');
-  try {
-    const res = await fetch('/api/backlinks/referring-domains', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({domain: domain, database: 'us'})
-    });
-    const data = await res.json();
-    if (data.success) {
-      const a = data.analysis;
-      let html = '<div class="metric-grid">';
-      html += '<div class="metric-card"><h3>Total</h3><div class="value">' + fmt(a.total) + '</div></div>';
-      html += '<div class="metric-card" style="background:#ff6b6b"><h3>Toxic</h3><div class="value">' + fmt(a.toxic) + '</div></div>';
-      html += '<div class="metric-card" style="background:#ffd93d"><h3>Caution</h3><div class="value">' + fmt(a.potentially_toxic) + '</div></div>';
-      html += '<div class="metric-card" style="background:#51cf66"><h3>Healthy</h3><div class="value">' + fmt(a.healthy) + '</div></div>';
-      html += '</div>';
-      document.getElementById('backlinks-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('backlinks-results', e.message);
-  }
-}
-
-async function getAnchors() {
-  const domain = document.getElementById('backlinks-input').value;
-  if (!domain) return;
-  showLoading('backlinks-results');
-  try {
-    const res = await fetch('/api/backlinks/anchors', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({domain: domain, database: 'us'})
-    });
-    const data = await res.json();
-    if (data.success) {
-      let html = '<div class="table-container"><table class="data-table"><thead><tr><th>Anchor</th><th>Domains</th></tr></thead><tbody>';
-      data.data.slice(0, 30).forEach(r => {
-        html += '<tr><td><strong>' + clean(r.anchor) + '</strong></td><td>' + fmt(clean(r.domains_num)) + '</td></tr>';
-      });
-      html += '</tbody></table></div>';
-      document.getElementById('backlinks-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('backlinks-results', e.message);
-  }
-}
-
-async function analyzeKeyword() {
-  const kw = document.getElementById('keyword-input').value;
-  const database = document.getElementById('keyword-db').value;
-  if (!kw) return;
-  showLoading('keywords-results');
-  try {
-    const res = await fetch('/api/keyword/overview', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({keyword: kw, database: database})
-    });
-    const data = await res.json();
-    if (data.success) {
-      const d = data.data;
-      let html = '<div class="metric-grid">';
-      html += '<div class="metric-card"><h3>Volume</h3><div class="value">' + fmt(clean(d['Search Volume'])) + '</div></div>';
-      html += '<div class="metric-card"><h3>CPC</h3><div class="value">$' + clean(d.CPC) + '</div></div>';
-      html += '</div>';
-      document.getElementById('keywords-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('keywords-results', e.message);
-  }
-}
-
-async function getRelated() {
-  const kw = document.getElementById('keyword-input').value;
-  const database = document.getElementById('keyword-db').value;
-  if (!kw) return;
-  showLoading('keywords-results');
-  try {
-    const res = await fetch('/api/keyword/related', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({keyword: kw, database: database, limit: 30})
-    });
-    const data = await res.json();
-    if (data.success) {
-      let html = '<div class="table-container"><table class="data-table"><thead><tr><th>Keyword</th><th>Volume</th></tr></thead><tbody>';
-      data.data.forEach(r => {
-        html += '<tr><td><strong>' + clean(r.Keyword) + '</strong></td><td>' + fmt(clean(r['Search Volume'])) + '</td></tr>';
-      });
-      html += '</tbody></table></div>';
-      document.getElementById('keywords-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('keywords-results', e.message);
-  }
-}
-
-async function completeAnalysis() {
-  const domain = document.getElementById('complete-input').value;
-  const database = document.getElementById('complete-db').value;
-  if (!domain) return;
-  currentDomain = domain;
-  showLoading('complete-results');
-  try {
-    const res = await fetch('/api/complete-analysis', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({domain: domain, database: database})
-    });
-    const data = await res.json();
-    if (data.success) {
-      const d = data.data;
-      let html = '';
-
-      if (d.domain_overview) {
-        const o = d.domain_overview;
-        currentMetrics.rank = o.Rank;
-        currentMetrics.organic_keywords = o['Organic Keywords'];
-        currentMetrics.organic_traffic = o['Organic Traffic'];
-        html += '<h3>Domain</h3><div class="metric-grid">';
-        html += '<div class="metric-card"><h3>Rank</h3><div class="value">#' + fmt(clean(o.Rank)) + '</div></div>';
-        html += '<div class="metric-card"><h3>Keywords</h3><div class="value">' + fmt(clean(o['Organic Keywords'])) + '</div></div>';
-        html += '<div class="metric-card"><h3>Traffic</h3><div class="value">' + fmt(clean(o['Organic Traffic'])) + '</div></div>';
-        html += '</div>';
-      }
-
-      if (d.backlinks_overview) {
-        const b = d.backlinks_overview;
-        currentMetrics.authority_score = b.ascore;
-        currentMetrics.backlinks = b.total;
-        currentMetrics.referring_domains = b.domains_num;
-        html += '<h3 style="margin-top:30px">Backlinks</h3><div class="metric-grid">';
-        html += '<div class="metric-card"><h3>Authority</h3><div class="value">' + clean(b.ascore) + '</div></div>';
-        html += '<div class="metric-card"><h3>Total</h3><div class="value">' + fmt(clean(b.total)) + '</div></div>';
-        html += '<div class="metric-card"><h3>Domains</h3><div class="value">' + fmt(clean(b.domains_num)) + '</div></div>';
-        html += '</div>';
-      }
-
-      if (d.onpage_analysis && d.onpage_analysis.crawl_success) {
-        const o = d.onpage_analysis;
-        currentOnPage = o;
-        html += '<div class="onpage-box" style="margin-top:30px"><h4>On-Page Analysis</h4>';
-        html += '<div class="onpage-item"><span class="onpage-label">Meta:</span><span class="onpage-value">' + o.meta_desc_status + ' (' + o.meta_desc_length + ')</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">Title:</span><span class="onpage-value">' + o.title_status + ' (' + o.title_length + ')</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">H1:</span><span class="onpage-value">' + o.h1_status + ' (' + o.h1_count + ')</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">Content:</span><span class="onpage-value">' + o.content_status + ' (' + o.word_count + ' words)</span></div>';
-        html += '</div>';
-      }
-
-      if (d.site_audit && d.site_audit.issues) {
-        currentSiteAudit = d.site_audit;
-        const issues = d.site_audit.issues;
-        const errors = issues.filter(i => i.severity === 'Error');
-        const warnings = issues.filter(i => i.severity === 'Warning');
-        const notices = issues.filter(i => i.severity === 'Notice');
-        html += '<div class="audit-box" style="margin-top:30px"><h4>🔍 Site Audit Summary</h4>';
-        html += '<div class="audit-item"><span class="audit-label">Total Issues:</span><span class="audit-value">' + issues.length + '</span></div>';
-        html += '<div class="audit-item"><span class="audit-label">Errors:</span><span class="audit-value error">' + errors.length + '</span></div>';
-        html += '<div class="audit-item"><span class="audit-label">Warnings:</span><span class="audit-value warning">' + warnings.length + '</span></div>';
-        html += '<div class="audit-item"><span class="audit-label">Notices:</span><span class="audit-value notice">' + notices.length + '</span></div>';
-        html += '</div>';
-      }
-
-      document.getElementById('complete-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('complete-results', e.message);
-  }
-}
-
-async function getSiteAuditIssues() {
-  const projectId = document.getElementById('project-id-input').value;
-  if (!projectId) return showError('site-audit-results', 'Enter project ID');
-  showLoading('site-audit-results');
-  try {
-    const res = await fetch('/api/site-audit/issues', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({project_id: projectId})
-    });
-    const data = await res.json();
-    if (data.success) {
-      currentSnapshotId = data.snapshot_id;
-      let html = '<h3>Site Audit Issues</h3>';
-
-      // Sort by severity and count
-      const severityOrder = {'Error': 1, 'Warning': 2, 'Notice': 3};
-      const sortedIssues = data.data.sort((a, b) => {
-        if (severityOrder[a.severity] !== severityOrder[b.severity]) {
-          return severityOrder[a.severity] - severityOrder[b.severity];
-        }
-        return b.count - a.count;
-      });
-
-      // Display by severity
-      for (const severity of ['Error', 'Warning', 'Notice']) {
-        const severityIssues = sortedIssues.filter(i => i.severity === severity);
-        if (severityIssues.length > 0) {
-          html += `<h4 style="margin-top:20px;color:${severity === 'Error' ? '#ef4444' : severity === 'Warning' ? '#f59e0b' : '#10b981'}">${severity}s</h4>`;
-          html += '<div class="table-container"><table class="data-table"><thead><tr><th>Issue</th><th>Count</th><th>Why and how to fix it</th><th>Actions</th></tr></thead><tbody>';
-
-          severityIssues.forEach(issue => {
-            const escapedName = issue.issue_name.replace(/'/g, "\\'");
-            html += `<tr>
-              <td><strong>${issue.issue_name}</strong></td>
-              <td>${issue.count}</td>
-              <td><button class="btn" onclick="showWhyAndHowToFix(${issue.issue_id}, '${escapedName}')" style="padding:5px 10px;font-size:0.8em">Why & How to Fix</button></td>
-              <td><button class="btn" onclick="viewIssueDetails(${issue.issue_id})" style="padding:5px 10px;font-size:0.8em">View Details</button></td>
-            </tr>`;
-          });
-
-          html += '</tbody></table></div>';
-        }
-      }
-
-      document.getElementById('site-audit-results').innerHTML = html;
-    } else {
-      showError('site-audit-results', data.message || 'Failed to fetch issues');
-    }
-  } catch (e) {
-    showError('site-audit-results', e.message);
-  }
-}
-
-async function getIssueDetails() {
-  const projectId = document.getElementById('project-id-input').value;
-  const issueId = document.getElementById('issue-id-input').value;
-
-  if (!projectId) return showError('site-audit-results', 'Enter project ID');
-  if (!issueId) return showError('site-audit-results', 'Enter issue ID');
-
-  showLoading('site-audit-results');
-  try {
-    const res = await fetch('/api/site-audit/issue-details', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({project_id: projectId, issue_id: parseInt(issueId)})
-    });
-    const data = await res.json();
-    if (data.success) {
-      let html = `<h3>Issue Details: ${data.issue_name} (ID: ${issueId})</h3>`;
-      html += `<p>Total pages: ${data.total}</p>`;
-
-      if (data.data && data.data.length > 0) {
-        html += '<div class="table-container"><table class="data-table"><thead><tr><th>URL</th><th>Title</th></tr></thead><tbody>';
-
-        data.data.slice(0, 50).forEach(page => {
-          // Try multiple possible URL field names
-          const url = page.target_url || page.url || page.page_url || page.page || 'N/A';
-          const title = page.title || page.page_title || 'N/A';
-
-          // Create a clickable link for the URL
-          const urlDisplay = url !== 'N/A' ? 
-            `<a href="${url}" target="_blank" class="url-link">${url}</a>` : 
-            'N/A';
-
-          html += `<tr><td>${urlDisplay}</td><td>${title}</td></tr>`;
-        });
-
-        html += '</tbody></table></div>';
-
-        if (data.total > 50) {
-          html += `<p>Showing first 50 of ${data.total} pages</p>`;
-        }
-      } else {
-        html += '<p>No pages found for this issue</p>';
-      }
-
-      document.getElementById('site-audit-results').innerHTML = html;
-    } else {
-      showError('site-audit-results', data.message || 'Failed to fetch issue details');
-    }
-  } catch (e) {
-    showError('site-audit-results', e.message);
-  }
-}
-
-async function viewIssueDetails(issueId) {
-  document.getElementById('issue-id-input').value = issueId;
-  getIssueDetails();
-}
+# Static Assets
+# Rendered, hashed and gzipped once at import so requests never rebuild or recompress a body
+def accepts_gzip(accept_encoding: str) -> bool:
+    """True when Accept-Encoding lists gzip without a q=0 (or otherwise unusable) weight"""
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if coding.lower() != "gzip":
+            continue
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+class StaticAsset:
+    def __init__(self, body: bytes, media_type: str, cache_control: str, link: Optional[str] = None):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        # Each representation needs its own strong validator
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.link = link
+
+    def response(self, request: Request) -> Response:
+        gzipped = accepts_gzip(request.headers.get("accept-encoding", ""))
+        etag = self.gzip_etag if gzipped else self.etag
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if self.link:
+            headers["Link"] = self.link
+        if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+            return Response(status_code=304, headers=headers)
+        if gzipped:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzipped, media_type=self.media_type, headers=headers)
+        return Response(self.body, media_type=self.media_type, headers=headers)
+
+
+def load_static_assets() -> Dict[str, StaticAsset]:
+    """Fingerprint everything in static/ as name.<hash>.ext and render the index page against those URLs"""
+    assets, urls = {}, {}
+    for path in sorted(STATIC_DIR.iterdir()):
+        body = path.read_bytes()
+        digest = hashlib.blake2b(body, digest_size=6).hexdigest()
+        hashed_name = f"{path.stem}.{digest}{path.suffix}"
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        assets[hashed_name] = StaticAsset(body, media_type, "public, max-age=31536000, immutable")
+        urls[path.name.replace(".", "_") + "_url"] = f"/static/{hashed_name}"
+    index = Template((TEMPLATE_DIR / "index.html").read_text(encoding="utf-8")).substitute(urls)
+    # The browser only ever talks to this origin, so preload hints beat preconnecting to SEMrush
+    link = f"<{urls['app_css_url']}>; rel=preload; as=style, <{urls['app_js_url']}>; rel=preload; as=script"
+    assets["index.html"] = StaticAsset(index.encode(), "text/html; charset=utf-8", "no-cache", link)
+    return assets
+
+
+STATIC_ASSETS = load_static_assets()
+
+
+@app.get("/static/{filename}", include_in_schema=False)
+async def static_asset(filename: str, request: Request):
+    asset = STATIC_ASSETS.get(filename)
+    if asset is None or filename == "index.html":
+        raise HTTPException(404, "Not found")
+    return asset.response(request)
 
-async function loadAI() {
-  if (!currentDomain) return showError('ai-results', 'Analyze domain first');
-  document.getElementById('ai-results').innerHTML = '<div class="ai-loading"><h3>🤖 Generating AI Recommendations...</h3><p>Analyzing: Business Goals + Website Data + On-Page + Site Audit</p><div><span class="ai-pulse"></span><span class="ai-pulse"></span><span class="ai-pulse"></span></div></div>';
-  try {
-    const res = await fetch('/api/recommendations', {
-      method: 'POST',
-      headers: {'Content-Type': 'application/json'},
-      body: JSON.stringify({
-        domain: currentDomain,
-        business_goals: businessGoals,
-        metrics: currentMetrics,
-        onpage_data: currentOnPage,
-        site_audit_data: currentSiteAudit
-      })
-    });
-    const data = await res.json();
-    if (data.success) {
-      let html = '';
-
-      if (data.onpage_data && data.onpage_data.crawl_success) {
-        const o = data.onpage_data;
-        html += '<div class="onpage-box"><h4>📊 On-Page Analysis Results</h4>';
-        html += '<div class="onpage-item"><span class="onpage-label">Meta:</span><span class="onpage-value">' + o.meta_desc_status + ' (' + o.meta_desc_length + ')</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">Title:</span><span class="onpage-value">' + o.title_status + ' (' + o.title_length + ')</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">H1:</span><span class="onpage-value">' + o.h1_status + ' (' + o.h1_count + ')</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">Headers:</span><span class="onpage-value">H2=' + o.h2_count + ', H3=' + o.h3_count + ', H4=' + o.h4_count + '</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">Content:</span><span class="onpage-value">' + o.content_status + ' (' + o.word_count + ' words)</span></div>';
-        html += '<div class="onpage-item"><span class="onpage-label">Images Missing Alt:</span><span class="onpage-value">' + o.images_without_alt + '/' + o.images_total + '</span></div>';
-        html += '</div>';
-      }
-
-      if (data.site_audit_data && data.site_audit_data.issues) {
-        const issues = data.site_audit_data.issues;
-        const errors = issues.filter(i => i.severity === 'Error');
-        const warnings = issues.filter(i => i.severity === 'Warning');
-        const notices = issues.filter(i => i.severity === 'Notice');
-        html += '<div class="audit-box"><h4>🔍 Site Audit Summary</h4>';
-        html += '<div class="audit-item"><span class="audit-label">Total Issues:</span><span class="audit-value">' + issues.length + '</span></div>';
-        html += '<div class="audit-item"><span class="audit-label">Errors:</span><span class="audit-value error">' + errors.length + '</span></div>';
-        html += '<div class="audit-item"><span class="audit-label">Warnings:</span><span class="audit-value warning">' + warnings.length + '</span></div>';
-        html += '<div class="audit-item"><span class="audit-label">Notices:</span><span class="audit-value notice">' + notices.length + '</span></div>';
-        html += '</div>';
-      }
-
-      data.recommendations.forEach(r => {
-        const badge = r.severity === 'high' ? 'severity-high' : 'severity-medium';
-        let steps = [];
-        if (r.fix && typeof r.fix === 'string') {
-          const regex = /\\d+\\.\\s*[^\\d]+(?=\\d+\\.|$)/g;
-          const match = r.fix.match(regex);
-          if (match) {
-            steps = match.map(s => s.replace(/^\\d+\\.\\s*/, '').trim()).filter(s => s);
-          }
-        }
-        html += '<div class="rec-card ' + r.severity + '">';
-        html += '<div class="rec-header"><div class="rec-icon">' + r.icon + '</div><div class="rec-title"><h3>' + r.category + '</h3><span class="severity-badge ' + badge + '">' + r.severity + '</span></div></div>';
-        html += '<div class="issue-section"><h4>⚠️ Issue</h4><p>' + r.issue + '</p></div>';
-        html += '<div class="fix-section"><h4>✅ How to Fix</h4><ol>';
-        if (steps.length > 0) {
-          steps.forEach(s => {
-            html += '<li>' + s + '</li>';
-          });
-        } else {
-          html += '<li>Follow SEO best practices</li>';
-        }
-        html += '</ol></div></div>';
-      });
 
-      document.getElementById('ai-results').innerHTML = html;
-    }
-  } catch (e) {
-    showError('ai-results', e.message);
-  }
-}
-</script>
-</body>
-</html>"""
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    return STATIC_ASSETS["index.html"].response(request)
 
 
 if __name__ == "__main__":
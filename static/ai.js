@@ -0,0 +1,171 @@
+// AI recommendations, fetched by app.js the first time the AI tab is opened
+
+// Generated recommendations are reused for 10 minutes while the inputs they were built from are unchanged;
+// failures are dropped so they can be retried. Regenerate sends regenerate: true, which also makes the
+// server skip its own memoized result and ask the model again.
+const AI_CACHE_TTL = 10 * 60 * 1000;
+const aiCache = new Map();
+
+// Only the fields the recommendation prompt reads are uploaded; the server recomputes the audit counts itself
+const ONPAGE_FIELDS = ['crawl_success', 'meta_desc_status', 'meta_desc_length', 'title_status', 'title_length',
+  'h1_status', 'h1_count', 'h2_count', 'h3_count', 'h4_count', 'content_status', 'word_count',
+  'images_without_alt', 'images_total'];
+
+function trimOnPage(o) {
+  if (!o) return o;
+  const out = {};
+  for (const field of ONPAGE_FIELDS) out[field] = o[field];
+  return out;
+}
+
+function trimSiteAudit(audit) {
+  if (!audit || !audit.issues) return audit;
+  return {issues: audit.issues.map(({severity, issue_name, count}) => ({severity, issue_name, count}))};
+}
+
+function fetchRecommendations(regenerate, signal) {
+  const payload = {
+    domain: currentDomain,
+    business_goals: businessGoals,
+    metrics: currentMetrics,
+    onpage_data: trimOnPage(currentOnPage),
+    site_audit_data: trimSiteAudit(currentSiteAudit)
+  };
+  const key = JSON.stringify(payload);
+  const hit = aiCache.get(key);
+  if (hit && !regenerate && !hit.signal.aborted && Date.now() - hit.ts < AI_CACHE_TTL) return hit.request;
+
+  const forget = () => {
+    if (aiCache.get(key) === entry) aiCache.delete(key);
+  };
+  const request = fetch('/api/recommendations', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: regenerate ? JSON.stringify(Object.assign({regenerate: true}, payload)) : key,
+    signal
+  }).then(res => res.json()).then(data => {
+    if (!data.success) forget();
+    return data;
+  }, e => {
+    forget();
+    throw e;
+  });
+  const entry = {ts: Date.now(), request, signal};
+  aiCache.set(key, entry);
+  return request;
+}
+
+// Summary boxes are kept per response object, so re-rendering a memoized response reuses them
+const boxCache = new WeakMap();
+
+function cachedBox(source, build) {
+  let box = boxCache.get(source);
+  if (!box) boxCache.set(source, box = build(source));
+  return box;
+}
+
+function onpageSummary(o) {
+  return summaryBox('onpage', '📊 On-Page Analysis Results', [
+    ['Meta:', o.meta_desc_status + ' (' + o.meta_desc_length + ')'],
+    ['Title:', o.title_status + ' (' + o.title_length + ')'],
+    ['H1:', o.h1_status + ' (' + o.h1_count + ')'],
+    ['Headers:', 'H2=' + o.h2_count + ', H3=' + o.h3_count + ', H4=' + o.h4_count],
+    ['Content:', o.content_status + ' (' + o.word_count + ' words)'],
+    ['Images Missing Alt:', o.images_without_alt + '/' + o.images_total]
+  ]);
+}
+
+// The first cards are built right away; the rest start as fixed-height stubs that are only
+// turned into cards once they come near the viewport
+const CARD_BATCH = 5;
+let cardObserver = null;
+
+function appendCards(container, recs) {
+  const eager = Math.min(CARD_BATCH, recs.length);
+  const frag = document.createDocumentFragment();
+  for (let i = 0; i < eager; i++) frag.appendChild(recCard(recs[i]));
+  const stubs = [];
+  for (let i = eager, n = recs.length; i < n; i++) {
+    const stub = document.createElement('div');
+    stub.className = 'rec-card-stub';
+    stub.dataset.idx = i;
+    stubs.push(frag.appendChild(stub));
+  }
+  container.appendChild(frag);
+  if (stubs.length === 0) return;
+
+  let pending = stubs.length;
+  const observer = cardObserver = new IntersectionObserver(entries => {
+    for (const entry of entries) {
+      if (!entry.isIntersecting) continue;
+      observer.unobserve(entry.target);
+      entry.target.replaceWith(recCard(recs[entry.target.dataset.idx]));
+      if (--pending === 0) observer.disconnect();
+    }
+  }, {rootMargin: '200px'});
+  for (const stub of stubs) observer.observe(stub);
+}
+
+// Aborted when a newer loadAI starts before this one's response has arrived
+let aiAbort = null;
+
+// Resolves to false when the recommendations could not be shown, so the caller can let a reopen retry
+async function loadAI(regenerate) {
+  if (aiAbort) aiAbort.abort();
+  const controller = aiAbort = new AbortController();
+  if (cardObserver) cardObserver.disconnect();
+  aiResultsEl.replaceChildren(fromTemplate('ai-loading-tpl'));
+  try {
+    const data = await fetchRecommendations(regenerate, controller.signal);
+    if (controller.signal.aborted) return true;
+    if (data.success) {
+      const frag = document.createDocumentFragment();
+
+      if (data.onpage_data && data.onpage_data.crawl_success) {
+        frag.appendChild(cachedBox(data.onpage_data, onpageSummary));
+      }
+
+      if (data.site_audit_data && data.site_audit_data.issues) {
+        frag.appendChild(cachedBox(data.site_audit_data, auditSummary));
+      }
+
+      aiResultsEl.replaceChildren(frag);
+      appendCards(aiResultsEl, data.recommendations);
+      return true;
+    }
+    showError(aiResultsEl, data.error || 'Failed');
+    return false;
+  } catch (e) {
+    if (e.name === 'AbortError') return true;
+    showError(aiResultsEl, e.message);
+    return false;
+  } finally {
+    if (aiAbort === controller) aiAbort = null;
+  }
+}
+
+// A numbered step runs until the next "N." marker; numbers inside a step ("301 redirects", "2.0") don't split it
+const STEP_RE = /\d+\.\s*.+?(?=\s+\d+\.(?!\d)|$)/gs;
+const STEP_PREFIX_RE = /^\d+\.\s*/;
+
+function recCard(r) {
+  let steps = [];
+  if (r.fix && typeof r.fix === 'string') {
+    const match = r.fix.match(STEP_RE);
+    if (match) {
+      steps = match.map(s => s.replace(STEP_PREFIX_RE, '').trim()).filter(s => s);
+    }
+  }
+  const card = fromTemplate('rec-card-tpl');
+  card.classList.add('rec-' + r.severity);
+  card.querySelector('.rec-icon').textContent = r.icon;
+  card.querySelector('.rec-category').textContent = r.category;
+  const badge = card.querySelector('.severity-badge');
+  badge.classList.add(r.severity === 'high' ? 'severity-high' : 'severity-medium');
+  badge.textContent = r.severity;
+  card.querySelector('.issue-text').textContent = r.issue;
+  const list = card.querySelector('.fix-steps');
+  if (steps.length === 0) steps = ['Follow SEO best practices'];
+  for (let i = 0, n = steps.length; i < n; i++) list.appendChild(el('li', steps[i])).className = 'fix-step';
+  return card;
+}
@@ -0,0 +1,602 @@
+let businessGoals = {objective:null,audience:null,conversion:null,strategy:null,stage:null,position:null};
+let currentMetrics = {rank:null,organic_keywords:null,organic_traffic:null,backlinks:null,referring_domains:null,authority_score:null};
+let currentOnPage = null;
+let currentDomain = null;
+let currentSnapshotId = null;
+// Issues of the last loaded project by issue_id; fetched page lists are kept on each issue
+let issueIndex = new Map();
+let issueIndexProject = null;
+let currentSiteAudit = null;
+
+// app.js is deferred, so the document is parsed by the time these are looked up
+const aiResultsEl = document.getElementById('ai-results');
+const siteAuditEl = document.getElementById('site-audit-results');
+const projectIdInput = document.getElementById('project-id-input');
+const issueIdInput = document.getElementById('issue-id-input');
+
+// SEMrush databases offered by the header #db select, filled in once the DOM is ready
+const DBS = [
+  ['us', '🇺🇸 United States'],
+  ['uk', '🇬🇧 United Kingdom'],
+  ['ca', '🇨🇦 Canada'],
+  ['au', '🇦🇺 Australia'],
+  ['in', '🇮🇳 India'],
+  ['de', '🇩🇪 Germany'],
+  ['fr', '🇫🇷 France'],
+  ['es', '🇪🇸 Spain'],
+  ['it', '🇮🇹 Italy'],
+  ['br', '🇧🇷 Brazil'],
+  ['mx', '🇲🇽 Mexico'],
+  ['ar', '🇦🇷 Argentina'],
+  ['nl', '🇳🇱 Netherlands'],
+  ['se', '🇸🇪 Sweden'],
+  ['pl', '🇵🇱 Poland'],
+  ['tr', '🇹🇷 Turkey'],
+  ['ru', '🇷🇺 Russia'],
+  ['jp', '🇯🇵 Japan'],
+  ['kr', '🇰🇷 South Korea'],
+  ['cn', '🇨🇳 China'],
+  ['sg', '🇸🇬 Singapore'],
+  ['ae', '🇦🇪 UAE'],
+  ['za', '🇿🇦 South Africa'],
+  ['ng', '🇳🇬 Nigeria']
+];
+
+function populateDatabases() {
+  const select = document.getElementById('db');
+  const frag = document.createDocumentFragment();
+  DBS.forEach(([value, label]) => frag.appendChild(new Option(label, value)));
+  select.appendChild(frag);
+  const saved = localStorage.getItem('db');
+  if (saved) select.value = saved;
+  select.addEventListener('change', () => localStorage.setItem('db', select.value));
+}
+
+document.addEventListener('DOMContentLoaded', populateDatabases);
+
+function selectOption(el, key, val) {
+  el.parentElement.querySelectorAll('.radio-option').forEach(e => e.classList.remove('selected'));
+  el.classList.add('selected');
+  el.querySelector('input').checked = true;
+  businessGoals[key] = val;
+}
+
+function switchTab(tab, button) {
+  document.querySelectorAll('.tab-content').forEach(e => e.classList.remove('active'));
+  document.querySelectorAll('.tab').forEach(e => e.classList.remove('active'));
+  document.getElementById(tab).classList.add('active');
+  button.classList.add('active');
+  if (tab === 'ai') openAI();
+}
+
+// One delegated listener for every tab button
+document.addEventListener('DOMContentLoaded', () => {
+  document.getElementById('tabs').addEventListener('click', e => {
+    const button = e.target.closest('.tab');
+    if (button) switchTab(button.dataset.tab, button);
+  });
+});
+
+function showLoading(box) {
+  box.replaceChildren(fromTemplate('loading-tpl'));
+}
+
+function errorBox(prefix, msg) {
+  const box = document.createElement('div');
+  box.className = 'alert-error';
+  box.append(el('strong', prefix), ' ' + msg);
+  return box;
+}
+function showError(box, msg) {
+  box.replaceChildren(errorBox('Error:', msg));
+}
+
+// Requests currently running, keyed by what they fetch; a repeat call joins the running one
+const inflight = new Map();
+
+function once(key, fn) {
+  if (inflight.has(key)) return inflight.get(key);
+  const pending = fn().finally(() => inflight.delete(key));
+  inflight.set(key, pending);
+  return pending;
+}
+
+const CLEAN_RE = /["\r]/g;
+function clean(val) {
+  if (val == null || val === '') return 'N/A';
+  return (typeof val === 'string' ? val : String(val)).replace(CLEAN_RE, '');
+}
+
+// One shared formatter; toLocaleString() would build a new one on every call
+const NUMBER_FORMAT = new Intl.NumberFormat(undefined, {maximumFractionDigits: 0});
+function fmt(val) {
+  if (val == null || val === '' || val === 'N/A') return 'N/A';
+  const n = Number(val);
+  return Number.isFinite(n) ? NUMBER_FORMAT.format(n) : 'N/A';
+}
+
+async function showWhyAndHowToFix(issueId, issueName) {
+  const modal = document.getElementById('issueModal');
+  const modalTitle = document.getElementById('modalTitle');
+  const modalLoading = document.getElementById('modalLoading');
+  const modalBody = document.getElementById('modalBody');
+  const modalAbout = document.getElementById('modalAbout');
+  const modalFix = document.getElementById('modalFix');
+
+  // Show modal
+  modal.style.display = 'block';
+  modalTitle.textContent = 'Issue #' + issueId + ': ' + issueName;
+
+  return once('explanation:' + issueId, async () => {
+    // A previous failure leaves an error box here, so the spinner is re-cloned on every open
+    modalLoading.replaceChildren(fromTemplate('modal-loading-tpl'));
+    modalLoading.style.display = 'block';
+    modalBody.style.display = 'none';
+
+    try {
+      const res = await fetch('/api/issue-explanation', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+          issue_id: issueId,
+          issue_name: issueName
+        })
+      });
+
+      const data = await res.json();
+
+      if (data.success) {
+        modalAbout.textContent = data.data.about;
+        modalFix.textContent = data.data.how_to_fix;
+        modalLoading.style.display = 'none';
+        modalBody.style.display = 'block';
+      } else {
+        modalLoading.replaceChildren(errorBox('Failed to generate explanation:', data.error || 'Unknown error'));
+      }
+    } catch (e) {
+      modalLoading.replaceChildren(errorBox('Error:', e.message));
+    }
+  });
+}
+
+function closeModal() {
+  document.getElementById('issueModal').style.display = 'none';
+}
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+  const modal = document.getElementById('issueModal');
+  if (event.target == modal) {
+    modal.style.display = 'none';
+  }
+}
+
+// Responses are reused for 15 minutes, keyed by request URL; failed calls are dropped so they can be retried.
+// The endpoints are plain GETs, so the browser's HTTP cache (ETag + max-age) also applies across reloads,
+// and a refresh sends Cache-Control: no-cache so the server refetches upstream instead of trusting any cache.
+const API_CACHE_TTL = 15 * 60 * 1000;
+const apiCache = new Map();
+
+function callApi(url, params, refresh) {
+  const key = url + '?' + new URLSearchParams(params);
+  const hit = apiCache.get(key);
+  if (hit && !refresh && Date.now() - hit.ts < API_CACHE_TTL) return hit.request;
+
+  const forget = () => {
+    if (apiCache.get(key) === entry) apiCache.delete(key);
+  };
+  const request = fetch(key, refresh ? {cache: 'no-cache', headers: {'Cache-Control': 'no-cache'}} : {}).then(res => res.json()).then(data => {
+    if (!data.success) forget();
+    return data;
+  }, e => {
+    forget();
+    throw e;
+  });
+  const entry = {ts: Date.now(), request};
+  apiCache.set(key, entry);
+  return request;
+}
+
+function metricCards(cards) {
+  const grid = document.createElement('div');
+  grid.className = 'metric-grid';
+  cards.forEach(([label, value, variant]) => {
+    const card = fromTemplate('metric-card-tpl');
+    if (variant) card.classList.add(variant);
+    card.querySelector('.metric-label').textContent = label;
+    card.querySelector('.metric-value').textContent = value;
+    grid.appendChild(card);
+  });
+  return grid;
+}
+// Builds an onpage-/audit- summary box; items are [label, value, extraValueClass]
+function summaryBox(kind, title, items) {
+  const box = document.createElement('div');
+  box.className = kind + '-box';
+  box.appendChild(el('h4', title)).className = kind + '-title';
+  items.forEach(([label, value, variant]) => {
+    const item = document.createElement('div');
+    item.className = kind + '-item';
+    item.appendChild(el('span', label)).className = kind + '-label';
+    item.appendChild(el('span', value)).className = kind + '-value' + (variant ? ' ' + variant : '');
+    box.appendChild(item);
+  });
+  return box;
+}
+
+// Severity totals come precomputed from the server alongside the issue list
+function auditSummary(audit) {
+  const counts = audit.counts;
+  return summaryBox('audit', '🔍 Site Audit Summary', [
+    ['Total Issues:', counts.total],
+    ['Errors:', counts.error, 'sev-error'],
+    ['Warnings:', counts.warning, 'sev-warning'],
+    ['Notices:', counts.notice, 'sev-notice']
+  ]);
+}
+
+// Tables are cloned from the page's <template>s and filled with textContent, then attached in one go
+function fromTemplate(id) {
+  return document.getElementById(id).content.firstElementChild.cloneNode(true);
+}
+
+function el(tag, text) {
+  const node = document.createElement(tag);
+  node.textContent = text;
+  return node;
+}
+
+// Rows beyond the first batch are only built once a sentinel row scrolls near the viewport
+const ROW_BATCH = 15;
+function dataTable(headers, rows, buildRow) {
+  const container = fromTemplate('table-tpl');
+  container.querySelector('thead tr').append(...headers.map(h => el('th', h)));
+  const tbody = container.querySelector('tbody');
+  const all = [].concat(rows);
+  let shown = 0;
+  function appendNext(before) {
+    const frag = document.createDocumentFragment();
+    const end = Math.min(shown + ROW_BATCH, all.length);
+    for (let i = shown; i < end; i++) frag.appendChild(buildRow(all[i]));
+    shown = end;
+    tbody.insertBefore(frag, before);
+  }
+  appendNext(null);
+  if (shown < all.length) {
+    const sentinel = tbody.insertRow();
+    sentinel.className = 'load-more';
+    sentinel.insertCell().colSpan = headers.length;
+    const observer = new IntersectionObserver(entries => {
+      if (!entries[0].isIntersecting) return;
+      appendNext(sentinel);
+      if (shown >= all.length) {
+        observer.disconnect();
+        sentinel.remove();
+      }
+    }, {rootMargin: '200px'});
+    observer.observe(sentinel);
+  }
+  return container;
+}
+
+function textRow(values) {
+  const row = fromTemplate('row-tpl');
+  row.querySelector('strong').textContent = values[0];
+  for (let i = 1; i < values.length; i++) row.insertCell().textContent = values[i];
+  return row;
+}
+
+function renderDomainOverview(data, body) {
+  const d = data.data;
+  currentDomain = body.domain;
+  currentMetrics.rank = d.Rank;
+  currentMetrics.organic_keywords = d['Organic Keywords'];
+  currentMetrics.organic_traffic = d['Organic Traffic'];
+  return metricCards([
+    ['Rank', '#' + fmt(clean(d.Rank))],
+    ['Keywords', fmt(clean(d['Organic Keywords']))],
+    ['Traffic', fmt(clean(d['Organic Traffic']))],
+    ['Value', '$' + fmt(clean(d['Organic Cost']))]
+  ]);
+}
+
+function renderCompleteAnalysis(data, body) {
+  const d = data.data;
+  currentDomain = body.domain;
+  const out = document.createDocumentFragment();
+
+  if (d.domain_overview) {
+    const o = d.domain_overview;
+    currentMetrics.rank = o.Rank;
+    currentMetrics.organic_keywords = o['Organic Keywords'];
+    currentMetrics.organic_traffic = o['Organic Traffic'];
+    out.append(el('h3', 'Domain'), metricCards([
+      ['Rank', '#' + fmt(clean(o.Rank))],
+      ['Keywords', fmt(clean(o['Organic Keywords']))],
+      ['Traffic', fmt(clean(o['Organic Traffic']))]
+    ]));
+  }
+
+  if (d.backlinks_overview) {
+    const b = d.backlinks_overview;
+    currentMetrics.authority_score = b.ascore;
+    currentMetrics.backlinks = b.total;
+    currentMetrics.referring_domains = b.domains_num;
+    out.appendChild(el('h3', 'Backlinks')).className = 'section-gap';
+    out.appendChild(metricCards([
+      ['Authority', clean(b.ascore)],
+      ['Total', fmt(clean(b.total))],
+      ['Domains', fmt(clean(b.domains_num))]
+    ]));
+  }
+
+  if (d.onpage_analysis && d.onpage_analysis.crawl_success) {
+    const o = d.onpage_analysis;
+    currentOnPage = o;
+    out.appendChild(summaryBox('onpage', 'On-Page Analysis', [
+      ['Meta:', o.meta_desc_status + ' (' + o.meta_desc_length + ')'],
+      ['Title:', o.title_status + ' (' + o.title_length + ')'],
+      ['H1:', o.h1_status + ' (' + o.h1_count + ')'],
+      ['Content:', o.content_status + ' (' + o.word_count + ' words)']
+    ])).classList.add('section-gap');
+  }
+
+  if (d.site_audit && d.site_audit.issues) {
+    currentSiteAudit = d.site_audit;
+    out.appendChild(auditSummary(d.site_audit)).classList.add('section-gap');
+  }
+
+  return out;
+}
+
+// One entry per analysis button: the endpoint, the inputs it sends, the panel it fills and how
+const ACTIONS = {
+  domainOverview: {
+    url: '/api/domain/overview', input: 'domain-input', field: 'domain', db: true, target: 'domain-results',
+    render: renderDomainOverview
+  },
+  organicKeywords: {
+    url: '/api/organic/keywords', input: 'organic-input', field: 'domain', db: true, target: 'organic-results',
+    render: data => dataTable(['Keyword', 'Pos', 'Volume'], [].concat(data.data).slice(0, 50),
+      r => textRow([clean(r.Keyword), clean(r.Position), fmt(clean(r['Search Volume']))]))
+  },
+  competitors: {
+    url: '/api/organic/competitors', input: 'organic-input', field: 'domain', db: true, target: 'organic-results',
+    render: data => dataTable(['Domain', 'Common', 'Organic'], data.data,
+      r => textRow([clean(r.Domain), fmt(clean(r['Common Keywords'])), fmt(clean(r['Organic Keywords']))]))
+  },
+  referringDomains: {
+    url: '/api/backlinks/referring-domains', input: 'backlinks-input', field: 'domain', target: 'backlinks-results',
+    render: data => {
+      const a = data.analysis;
+      return metricCards([
+        ['Total', fmt(a.total)],
+        ['Toxic', fmt(a.toxic), 'metric-toxic'],
+        ['Caution', fmt(a.potentially_toxic), 'metric-caution'],
+        ['Healthy', fmt(a.healthy), 'metric-healthy']
+      ]);
+    }
+  },
+  anchors: {
+    url: '/api/backlinks/anchors', input: 'backlinks-input', field: 'domain', target: 'backlinks-results',
+    render: data => dataTable(['Anchor', 'Domains'], [].concat(data.data).slice(0, 30),
+      r => textRow([clean(r.anchor), fmt(clean(r.domains_num))]))
+  },
+  keywordOverview: {
+    url: '/api/keyword/overview', input: 'keyword-input', field: 'keyword', db: true, target: 'keywords-results',
+    render: data => metricCards([
+      ['Volume', fmt(clean(data.data['Search Volume']))],
+      ['CPC', '$' + clean(data.data.CPC)]
+    ])
+  },
+  relatedKeywords: {
+    url: '/api/keyword/related', input: 'keyword-input', field: 'keyword', db: true, target: 'keywords-results',
+    extra: {limit: 30},
+    render: data => dataTable(['Keyword', 'Volume'], data.data, r => textRow([clean(r.Keyword), fmt(clean(r['Search Volume']))]))
+  },
+  completeAnalysis: {
+    url: '/api/complete-analysis', input: 'complete-input', field: 'domain', db: true, target: 'complete-results',
+    render: renderCompleteAnalysis
+  }
+};
+
+async function runAction(name, refresh, button) {
+  const action = ACTIONS[name];
+  const target = document.getElementById(action.target);
+  const value = document.getElementById(action.input).value;
+  if (!value) return showError(target, 'Enter ' + action.field);
+  const body = Object.assign({[action.field]: value, database: action.db ? document.getElementById('db').value : 'us'},
+    action.extra);
+  // The button stays disabled until its request settles, so double clicks cannot queue repeats
+  button.disabled = true;
+  showLoading(target);
+  try {
+    const data = await callApi(action.url, body, refresh);
+    if (data.success) {
+      target.replaceChildren(action.render(data, body));
+    } else {
+      showError(target, data.message || data.error || data.detail || 'Failed');
+    }
+  } catch (e) {
+    showError(target, e.message);
+  } finally {
+    button.disabled = false;
+  }
+}
+
+// One delegated listener for every analysis button
+document.addEventListener('click', e => {
+  const button = e.target.closest('[data-action]');
+  if (button) runAction(button.dataset.action, 'refresh' in button.dataset, button);
+});
+
+// Severity colours live in CSS; renderers only pick the class
+const SEVERITY_CLASS = {Error: 'sev-error', Warning: 'sev-warning', Notice: 'sev-notice'};
+
+function issueRow(issue) {
+  const row = fromTemplate('issue-row-tpl');
+  const [why, details] = row.querySelectorAll('button');
+  row.querySelector('strong').textContent = issue.issue_name;
+  row.cells[1].textContent = issue.count;
+  why.onclick = () => showWhyAndHowToFix(issue.issue_id, issue.issue_name);
+  details.onclick = () => viewIssueDetails(issue.issue_id);
+  return row;
+}
+
+// Long page URLs are cut to this many characters in the table; the link and tooltip keep the full URL
+const URL_DISPLAY_MAX = 60;
+
+function pageRow(page) {
+  // Try multiple possible URL field names
+  const url = page.target_url || page.url || page.page_url || page.page || 'N/A';
+  const row = fromTemplate('page-row-tpl');
+  const link = row.querySelector('a');
+  // Only real web URLs become links
+  if (/^https?:\/\//i.test(url)) {
+    link.href = url;
+    link.title = url;
+    link.textContent = url.length > URL_DISPLAY_MAX ? url.slice(0, URL_DISPLAY_MAX) + '…' : url;
+  } else {
+    link.replaceWith(url);
+  }
+  row.cells[1].textContent = page.title || page.page_title || 'N/A';
+  return row;
+}
+
+// The site-audit panel shows one response at a time; a new request aborts the one still downloading
+let siteAuditAbort = null;
+
+function claimSiteAudit() {
+  if (siteAuditAbort) siteAuditAbort.abort();
+  siteAuditAbort = new AbortController();
+  return siteAuditAbort.signal;
+}
+
+async function getSiteAuditIssues() {
+  const projectId = projectIdInput.value;
+  if (!projectId) return showError(siteAuditEl, 'Enter project ID');
+  return once('issues:' + projectId, async () => {
+    const signal = claimSiteAudit();
+    showLoading(siteAuditEl);
+    try {
+      const res = await fetch('/api/site-audit/issues?' + new URLSearchParams({project_id: projectId}), {signal});
+      const data = await res.json();
+      if (data.success) {
+        // Page lists already fetched stay valid while the project's snapshot is unchanged
+        const previous = projectId === issueIndexProject && data.snapshot_id === currentSnapshotId ? issueIndex : new Map();
+        currentSnapshotId = data.snapshot_id;
+        issueIndex = new Map(data.data.map(i => [i.issue_id, Object.assign(i, {details: (previous.get(i.issue_id) || {}).details})]));
+        issueIndexProject = projectId;
+        const frag = document.createDocumentFragment();
+        frag.appendChild(el('h3', 'Site Audit Issues'));
+
+        // Bucket by severity in one pass, then order each bucket by count
+        const buckets = {Error: [], Warning: [], Notice: []};
+        for (const issue of data.data) (buckets[issue.severity] ||= []).push(issue);
+
+        // Display by severity
+        for (const severity of ['Error', 'Warning', 'Notice']) {
+          const severityIssues = buckets[severity].sort((a, b) => b.count - a.count);
+          if (severityIssues.length > 0) {
+            const heading = el('h4', severity + 's');
+            heading.className = 'sev-heading ' + SEVERITY_CLASS[severity];
+            frag.append(heading, dataTable(['Issue', 'Count', 'Why and how to fix it', 'Actions'], severityIssues, issueRow));
+          }
+        }
+
+        siteAuditEl.replaceChildren(frag);
+      } else {
+        showError(siteAuditEl, data.message || 'Failed to fetch issues');
+      }
+    } catch (e) {
+      if (e.name !== 'AbortError') showError(siteAuditEl, e.message);
+    }
+  });
+}
+
+function renderIssueDetails(issueId, data) {
+  const frag = document.createDocumentFragment();
+  frag.append(el('h3', 'Issue Details: ' + data.issue_name + ' (ID: ' + issueId + ')'), el('p', 'Total pages: ' + data.total));
+
+  if (data.data && data.data.length > 0) {
+    frag.appendChild(dataTable(['URL', 'Title'], data.data.slice(0, 50), pageRow));
+    if (data.total > 50) {
+      frag.appendChild(el('p', 'Showing first 50 of ' + data.total + ' pages'));
+    }
+  } else {
+    frag.appendChild(el('p', 'No pages found for this issue'));
+  }
+
+  siteAuditEl.replaceChildren(frag);
+}
+
+async function getIssueDetails() {
+  const projectId = projectIdInput.value;
+  const issueId = issueIdInput.value;
+
+  if (!projectId) return showError(siteAuditEl, 'Enter project ID');
+  if (!issueId) return showError(siteAuditEl, 'Enter issue ID');
+
+  const issue = projectId === issueIndexProject ? issueIndex.get(parseInt(issueId)) : undefined;
+  if (issue && issue.details) {
+    claimSiteAudit();
+    return renderIssueDetails(issueId, issue.details);
+  }
+
+  return once('details:' + projectId + ':' + issueId, async () => {
+    const signal = claimSiteAudit();
+    showLoading(siteAuditEl);
+    try {
+      const res = await fetch('/api/site-audit/issue-details', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({project_id: projectId, issue_id: parseInt(issueId)}),
+        signal
+      });
+      const data = await res.json();
+      if (data.success) {
+        if (issue) issue.details = data;
+        renderIssueDetails(issueId, data);
+      } else {
+        showError(siteAuditEl, data.message || 'Failed to fetch issue details');
+      }
+    } catch (e) {
+      if (e.name !== 'AbortError') showError(siteAuditEl, e.message);
+    }
+  });
+}
+
+async function viewIssueDetails(issueId) {
+  issueIdInput.value = issueId;
+  return getIssueDetails();
+}
+
+// The AI pipeline is the expensive path: ai.js is fetched on first use and recommendations
+// are generated once per analysed domain unless explicitly regenerated
+let aiLoadedFor = null;
+let aiScript = null;
+
+function loadAIScript() {
+  aiScript ||= new Promise((resolve, reject) => {
+    const script = document.createElement('script');
+    script.src = document.getElementById('ai').dataset.script;
+    script.onload = resolve;
+    script.onerror = reject;
+    document.head.appendChild(script);
+  });
+  return aiScript;
+}
+
+function openAI(regenerate) {
+  if (!currentDomain) return showError(aiResultsEl, 'Analyze domain first');
+  if (!regenerate && aiLoadedFor === currentDomain) return;
+  const domain = aiLoadedFor = currentDomain;
+  loadAIScript().then(() => loadAI(regenerate), () => {
+    aiScript = null;
+    showError(aiResultsEl, 'Could not load the AI module');
+    return false;
+  }).then(ok => {
+    // A failed load must not count as loaded, or reopening the tab would never retry
+    if (!ok && aiLoadedFor === domain) aiLoadedFor = null;
+  });
+}